@@ -1,115 +1,44 @@
-import sqlite3
 import tkinter as tk
-from tkinter import ttk
+from tkinter import filedialog
 import ttkbootstrap as tb
 from ttkbootstrap.constants import *
 from PIL import Image, ImageTk
-import requests, zipfile, io, os, sys, threading, time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import datetime, logging, os, threading, time
 
-UPDATE_BASE_URL = "https://raw.githubusercontent.com//sutsujepet/SeriesChecker/main"
+from schedule_engine import (
+    SCHEDULE_DB, resource_path, read_local_version, check_for_updates, load_schedule_model, get_schedule_model,
+    analyze_schedule, filter_series, save_ownership_changes, read_catalog, reset_ownership_to_free,
+    start_db_worker, run_db, database_stats, timed, set_profiling, profiling_enabled, begin_interaction,
+    last_interaction, SeasonPlanner, write_season_csv, write_season_ical, OWNERSHIP_LISTENERS,
+    COVERAGE_WEEKS, COVERAGE_OWNED, COVERAGE_NO_TRACK, COVERAGE_NO_CAR, COVERAGE_NO_CAR_TRACK,
+)
+
+START_TIME = time.perf_counter()
+
+log = logging.getLogger("SeriesChecker")
+if os.environ.get("SERIESCHECKER_DEBUG"):
+    logging.basicConfig(filename="debug.log", level=logging.DEBUG, format="%(asctime)s %(levelname)s %(message)s")
 
 def safe_update_status(text):
+    global UPDATE_STATUS_TEXT
+    UPDATE_STATUS_TEXT = text
     if update_status and update_status.winfo_exists():
         update_status.config(text=text)
 
-def check_for_updates():
-    try:
-        version_url = f"{UPDATE_BASE_URL}/version.txt"
-        data_url = f"{UPDATE_BASE_URL}/data.zip"
-        local_version_path = os.path.join("data", "local_version.txt")
-
-        # 🔹 Determine local version
-        LOCAL_VERSION = None
-        if os.path.exists(local_version_path):
-            try:
-                with open(local_version_path, "r", encoding="utf-8") as f:
-                    LOCAL_VERSION = f.read().strip()
-            except Exception:
-                LOCAL_VERSION = None
-
-        # 🔹 Load initial data if no local version exists
-        if not LOCAL_VERSION:
-            root.after(0, lambda: safe_update_status("⬇️ Loading initial data..."))
-            r = requests.get(data_url, timeout=30)
-            r.raise_for_status()
-            if os.path.exists("data"):
-                import shutil
-                shutil.rmtree("data", ignore_errors=True)
-            with zipfile.ZipFile(io.BytesIO(r.content)) as z:
-                z.extractall("data")
-
-            online_version = requests.get(version_url, timeout=5).text.strip()
-            os.makedirs("data", exist_ok=True)
-            with open(local_version_path, "w", encoding="utf-8") as f:
-                f.write(online_version)
-            root.after(0, lambda: safe_update_status(f"✅ Initial data loaded (v{online_version})"))
-            return
-
-        # 🔹 Check online version
-        online_version = requests.get(version_url, timeout=5).text.strip()
-        if online_version != LOCAL_VERSION:
-            root.after(0, lambda: safe_update_status(f"🆕 New version {online_version} – updating..."))
-
-            # Save license state
-            owned_cars, owned_tracks = set(), set()
-            if os.path.exists(CARS_DB):
-                conn = sqlite3.connect(CARS_DB)
-                cur = conn.cursor()
-                cur.execute("SELECT name FROM cars WHERE licensed = 1")
-                owned_cars = {r[0] for r in cur.fetchall()}
-                conn.close()
-            if os.path.exists(TRACKS_DB):
-                conn = sqlite3.connect(TRACKS_DB)
-                cur = conn.cursor()
-                cur.execute("SELECT name FROM tracks WHERE licensed = 1")
-                owned_tracks = {r[0] for r in cur.fetchall()}
-                conn.close()
-
-            # Download and extract new data package
-            r = requests.get(data_url, timeout=30)
-            r.raise_for_status()
-            import shutil
-            if os.path.exists("data"):
-                shutil.rmtree("data", ignore_errors=True)
-            with zipfile.ZipFile(io.BytesIO(r.content)) as z:
-                z.extractall("data")
-
-            # Restore license state
-            if os.path.exists("data/cars.db"):
-                conn = sqlite3.connect("data/cars.db")
-                cur = conn.cursor()
-                for n in owned_cars:
-                    cur.execute("UPDATE cars SET licensed = 1 WHERE name = ?", (n,))
-                conn.commit()
-                conn.close()
-            if os.path.exists("data/tracks.db"):
-                conn = sqlite3.connect("data/tracks.db")
-                cur = conn.cursor()
-                for n in owned_tracks:
-                    cur.execute("UPDATE tracks SET licensed = 1 WHERE name = ?", (n,))
-                conn.commit()
-                conn.close()
-
-            with open(local_version_path, "w", encoding="utf-8") as f:
-                f.write(online_version)
-            root.after(0, lambda: safe_update_status(f"✅ Update completed (v{online_version})"))
-        else:
-            root.after(0, lambda: safe_update_status("✅ Data is up to date."))
-    except Exception as e:
-        root.after(0, lambda: safe_update_status(f"⚠️ Update failed: {e}"))
+def report_update_status(text):
+    root.after(0, lambda: safe_update_status(text))
 
-def resource_path(relative_path):
-    """Return absolute path to resource (works in .exe too)"""
-    base_path = getattr(sys, '_MEIPASS', os.path.dirname(os.path.abspath(__file__)))
-    if relative_path.startswith("data"):
-        base_path = os.path.dirname(os.path.abspath(sys.executable)) if getattr(sys, 'frozen', False) else os.path.abspath(".")
-    return os.path.join(base_path, relative_path)
+ICON_PATH = resource_path("data/icon.ico")
+IMAGE_CACHE_DIR = resource_path("data/cache")
 
-CARS_DB = resource_path("data/cars.db")
-TRACKS_DB = resource_path("data/tracks.db")
-SCHEDULE_DB = resource_path("data/schedule.db")
+ASSET_CACHE_SIZE = 16
+ASSET_SOURCE_CACHE_SIZE = 4
+ASSET_WORKERS = 2
 
 CURRENT_PAGE = 0
+AUTOSAVE_DELAY_MS = 1500
 
 FILTER_STATE = {
     "category": "All",
@@ -121,6 +50,10 @@ FILTER_STATE = {
 }
 
 root = tb.Window(themename="darkly")
+
+# All database work runs on one worker thread; results come back through the Tk event loop
+DB_WORKER = start_db_worker(lambda callback: root.after(0, callback))
+PENDING_SAVE = None    # Saves the content menu's unsaved toggles; set while that menu is in use
 root.overrideredirect(True)
 root.configure(bg="#1a1a1a")
 
@@ -131,17 +64,138 @@ pos_x = int((screen_w - splash_w) / 2)
 pos_y = int((screen_h - splash_h) / 2)
 root.geometry(f"{splash_w}x{splash_h}+{pos_x}+{pos_y}")
 
+class AssetManager:
+    """Decodes images, resamples on a background pool and keeps sources and PhotoImage variants in bounded LRUs.
+
+    Resampled sizes are also cached on disk as PNG, so later starts skip decoding the source entirely.
+    """
+
+    def __init__(self, max_photos=ASSET_CACHE_SIZE, workers=ASSET_WORKERS, max_sources=ASSET_SOURCE_CACHE_SIZE):
+        self.max_photos = max_photos
+        self.max_sources = max_sources
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="assets")
+        self.lock = threading.Lock()
+        self.sources = OrderedDict() # path -> decoded PIL image, least recently used first
+        self.resized = {}           # (path, size) -> Future of the resampled PIL image
+        self.photos = OrderedDict() # (path, size) -> PhotoImage, least recently used first
+
+    def source(self, path):
+        with self.lock:
+            img = self.sources.get(path)
+            if img is not None:
+                self.sources.move_to_end(path)
+        if img is None:
+            img = Image.open(path)
+            img.load()
+            with self.lock:
+                img = self.sources.setdefault(path, img)
+                # Resampled variants are cached on disk, so an evicted source is only decoded again for a new size
+                while len(self.sources) > self.max_sources:
+                    self.sources.popitem(last=False)
+        return img
+
+    @timed("image.decode")
+    def _resample(self, path, size):
+        stat = os.stat(path)
+        base = os.path.splitext(os.path.basename(path))[0]
+        cache_path = os.path.join(IMAGE_CACHE_DIR, f"{base}_{size[0]}x{size[1]}_{stat.st_size}_{int(stat.st_mtime)}.png")
+        if os.path.exists(cache_path):
+            img = Image.open(cache_path)
+            img.load()
+            return img
+
+        img = self.source(path).resize(size)
+        try:
+            os.makedirs(IMAGE_CACHE_DIR, exist_ok=True)
+            img.save(cache_path + ".tmp", format="PNG")
+            os.replace(cache_path + ".tmp", cache_path)
+        except OSError:
+            pass
+        return img
+
+    def prefetch(self, path, size):
+        """Start resampling path to size in the background and return the Future; any thread"""
+        key = (path, size)
+        with self.lock:
+            future = self.resized.get(key)
+            started = future is None
+            if started:
+                future = self.resized[key] = self.pool.submit(self._resample, path, size)
+        if started:
+            # Outside the lock: the callback runs right here if the future has already finished
+            future.add_done_callback(lambda done: self._forget_failed(key, done))
+        return future
+
+    def _forget_failed(self, key, future):
+        # A failed load (e.g. the icon before the first data download) is retried by the next request
+        if future.exception() is not None:
+            with self.lock:
+                if self.resized.get(key) is future:
+                    del self.resized[key]
+
+    def photo(self, path, size):
+        """PhotoImage of path at size, waiting for the resample if needed; Tk thread only"""
+        key = (path, size)
+        photo = self.photos.get(key)
+        if photo is not None:
+            self.photos.move_to_end(key)
+            return photo
+        photo = ImageTk.PhotoImage(self.prefetch(path, size).result())
+        self.photos[key] = photo
+        while len(self.photos) > self.max_photos:
+            evicted, _photo = self.photos.popitem(last=False)
+            with self.lock:
+                self.resized.pop(evicted, None)
+        return photo
+
+    def request(self, path, size, callback):
+        """Call callback(photo) on the Tk thread once path is resampled to size, without blocking"""
+        if (path, size) in self.photos:
+            callback(self.photo(path, size))
+            return
+
+        def deliver(future):
+            if future.exception() is None:
+                root.after(0, lambda: callback(self.photo(path, size)))
+            else:
+                log.debug("Image %s not loaded: %s", path, future.exception())
+        self.prefetch(path, size).add_done_callback(deliver)
+
+ASSETS = AssetManager()
+
 try:
-    icon_path = resource_path("data/icon.ico")
-    icon_img = Image.open(icon_path)
-    icon_img = icon_img.resize((512, 512))
-    icon_tk = ImageTk.PhotoImage(icon_img)
-    splash_label = tk.Label(root, image=icon_tk, bg="#1a1a1a")
+    splash_label = tk.Label(root, bg="#1a1a1a")
+    splash_label.image = ASSETS.photo(ICON_PATH, (512, 512))
+    splash_label.configure(image=splash_label.image)
     splash_label.place(relx=0.5, rely=0.5, anchor="center")
-    root.icon_ref = icon_tk
 except Exception:
     tk.Label(root, text="iRacing Planner", font=("Segoe UI", 26, "bold"), fg="white", bg="#1a1a1a").place(relx=0.5, rely=0.5, anchor="center")
 
+LOGO_SIZE = (int(screen_w * 0.8), int(screen_w * 0.25))
+STARTUP_READY = threading.Event()
+
+def prepare_startup():
+    """Load cached data and the scaled logo while the splash is visible"""
+    t0 = time.perf_counter()
+    try:
+        if os.path.exists(SCHEDULE_DB):
+            run_db(load_schedule_model)
+    except Exception as e:
+        log.debug("Schedule model not loaded at startup: %s", e)
+    t1 = time.perf_counter()
+    try:
+        ASSETS.prefetch(ICON_PATH, LOGO_SIZE).result()
+    except Exception as e:
+        log.debug("Logo not loaded at startup: %s", e)
+    log.debug("Startup: schedule model %.3f s, logo %.3f s", t1 - t0, time.perf_counter() - t1)
+    STARTUP_READY.set()
+
+def wait_for_startup():
+    if STARTUP_READY.is_set():
+        show_main_window()
+    else:
+        root.after(20, wait_for_startup)
+
 def show_main_window():
     root.overrideredirect(False)
     root.geometry("")
@@ -149,78 +203,210 @@ def show_main_window():
     root.configure(bg="#1a1a1a")
     for widget in root.winfo_children():
         widget.destroy()
+    show_update_status_bar()
     show_main_menu()
-
-root.after(4000, show_main_window)
+    root.after_idle(lambda: log.debug("Time to interactive: %.3f s", time.perf_counter() - START_TIME))
+    if profiling_enabled():
+        toggle_perf_overlay()
 
 ACCENT_COLOR = "#E63946"
 BG_COLOR = "#1a1a1a"
 root.configure(bg=BG_COLOR)
 
-# Update status label
-update_status = tb.Label(root, text="🔍 Checking for updates...", font=("Segoe UI", 10), background=BG_COLOR)
+# Update status bar: created by show_main_window and kept by clear_window, so download progress and
+# update results stay visible on every screen; reports from before it exists are shown once it does
+update_status = None
+UPDATE_STATUS_TEXT = "🔍 Checking for updates..."
+
+# Owned content the last update no longer lists; shown on the main menu until the app is closed
+DROPPED_CONTENT = []
+dropped_label = None
+
+def dropped_content_text():
+    return ("⚠️ Nach dem Update nicht mehr im Katalog (Lizenz konnte nicht übernommen werden):\n"
+            + ", ".join(DROPPED_CONTENT)) if DROPPED_CONTENT else ""
+
+def show_dropped_content(names):
+    DROPPED_CONTENT[:] = names
+    if dropped_label is not None and dropped_label.winfo_exists():
+        dropped_label.config(text=dropped_content_text())
+
+# Until the first data install has finished there is nothing to load, so the screens stay locked
+DATA_READY = bool(read_local_version())
+data_buttons = []
+
+def unlock_data_screens():
+    global DATA_READY
+    DATA_READY = True
+    for button in data_buttons:
+        if button.winfo_exists():
+            button.configure(state="normal")
+
+def run_update_check():
+    try:
+        dropped = check_for_updates(report_update_status)
+    finally:
+        root.after(0, unlock_data_screens)
+    if dropped:
+        root.after(0, lambda: show_dropped_content(dropped))
+
+def show_update_status_bar():
+    global update_status
+    update_status = tb.Label(root, text=UPDATE_STATUS_TEXT, font=("Segoe UI", 10), anchor="w",
+                             background="#111111", padding=(10, 3))
+    update_status.pack(side="bottom", fill="x")
+
+# Performance overlay, toggled with Ctrl+Shift+P (or on from the start with SERIESCHECKER_PROFILE)
+PERF_OVERLAY = None
+PERF_OVERLAY_REFRESH_MS = 500
+PERF_OVERLAY_LINES = 8
+
+def refresh_perf_overlay():
+    if PERF_OVERLAY is None or not PERF_OVERLAY.winfo_exists():
+        return
+    name, spans = last_interaction()
+    totals = {}
+    for span_name, _detail, ms in spans:
+        calls, total = totals.get(span_name, (0, 0.0))
+        totals[span_name] = (calls + 1, total + ms)
+    lines = [f"⏱ {name or '–'}"]
+    for span_name, (calls, total) in sorted(totals.items(), key=lambda item: -item[1][1])[:PERF_OVERLAY_LINES]:
+        lines.append(f"{span_name:<16} {total:8.1f} ms  ×{calls}")
+    PERF_OVERLAY.config(text="\n".join(lines))
+    PERF_OVERLAY.lift()
+    root.after(PERF_OVERLAY_REFRESH_MS, refresh_perf_overlay)
+
+def toggle_perf_overlay(_event=None):
+    global PERF_OVERLAY
+    if PERF_OVERLAY is not None:
+        PERF_OVERLAY.destroy()
+        PERF_OVERLAY = None
+        set_profiling(False)
+        return
+    set_profiling(True)
+    PERF_OVERLAY = tk.Label(root, justify="left", anchor="nw", font=("Consolas", 9), fg="#5cb85c", bg="#000000")
+    PERF_OVERLAY.place(relx=1.0, rely=0.0, anchor="ne")
+    refresh_perf_overlay()
+
+root.bind_all("<Control-Shift-P>", toggle_perf_overlay)
 
 # --- Utility functions ---
-def get_licensed_names(db_path, table):
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
-    cursor.execute(f"SELECT name FROM {table} WHERE licensed = 1")
-    names = [row[0] for row in cursor.fetchall()]
-    conn.close()
-    return names
-
-def analyze_schedule():
-    car_conn = sqlite3.connect(CARS_DB)
-    c_cursor = car_conn.cursor()
-    c_cursor.execute("SELECT name FROM cars WHERE licensed = 1")
-    licensed_cars = {row[0] for row in c_cursor.fetchall()}
-    car_conn.close()
-
-    track_conn = sqlite3.connect(TRACKS_DB)
-    t_cursor = track_conn.cursor()
-    t_cursor.execute("SELECT name FROM tracks WHERE licensed = 1")
-    licensed_tracks = {row[0] for row in t_cursor.fetchall()}
-    track_conn.close()
-
-    conn = sqlite3.connect(SCHEDULE_DB)
-    cursor = conn.cursor()
-    cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
-    tables = [row[0] for row in cursor.fetchall()]
-
-    result = []
-    for table in tables:
-        cursor.execute(f"SELECT cars, track FROM {table}")
-        rows = cursor.fetchall()
-        all_cars_in_series = {row[0] for row in rows if row[0]}
-        has_any_car = any(car in licensed_cars for car in all_cars_in_series)
-
-        if not has_any_car:
-            continue
-
-        driveable_weeks = []
-        for week_index, (car_name, track_name) in enumerate(rows, start=1):
-            if track_name in licensed_tracks:
-                driveable_weeks.append(week_index)
-
-        if driveable_weeks:
-            result.append((table, driveable_weeks))
-
-    conn.close()
-    result.sort(key=lambda x: len(x[1]), reverse=True)
-    return result
+def show_job_error(label, text="❌ Laden fehlgeschlagen"):
+    """on_error callback for a database job that puts the error in place of the label's loading text"""
+    def show(error):
+        if label.winfo_exists():
+            label.config(text=f"{text}: {error}", bootstyle="danger")
+    return show
+
+def exit_app():
+    """Write pending content toggles and let queued database jobs finish before closing"""
+    if PENDING_SAVE is not None:
+        PENDING_SAVE()
+    # The worker is a daemon thread; an empty job waits for everything submitted before it
+    DB_WORKER.call(lambda: None)
+    root.destroy()
 
 def clear_window():
     for widget in root.winfo_children():
-        widget.destroy()
+        if widget is not PERF_OVERLAY and widget is not update_status:
+            widget.destroy()
+
+class VirtualGrid:
+    """Paged grid that keeps a fixed pool of cell widgets and only rebinds them on page or item changes"""
+
+    def __init__(self, parent, make_cell, bind_cell, rows_per_column=20, columns_per_page=3,
+                 cell_pady=3, empty_text="", on_page=None):
+        self.bind_cell = bind_cell
+        self.rows_per_column = rows_per_column
+        self.columns_per_page = columns_per_page
+        self.on_page = on_page
+        self.items = []
+        self.page = 0
+        self.width = None
+
+        self.frame = tb.Frame(parent)
+        self.frame.pack(fill="both", expand=True)
+        self.columns_frame = tb.Frame(self.frame)
+        self.columns_frame.pack(expand=True)
+        self.empty_label = tb.Label(self.frame, text=empty_text, bootstyle="danger")
+        self.page_bar = tb.Frame(self.frame)
+        self.page_bar.pack(pady=10)
+        self.page_buttons_frame = tb.Frame(self.page_bar)
+        self.page_buttons_frame.pack(side="left")
+        self.page_buttons = []
+
+        self.column_frames = []
+        self.cells = []
+        for col in range(columns_per_page):
+            col_frame = tb.Frame(self.columns_frame)
+            col_frame.columnconfigure(0, weight=1)
+            self.column_frames.append(col_frame)
+            for row in range(rows_per_column):
+                cell = make_cell(col_frame)
+                cell.grid(row=row, column=0, pady=cell_pady, sticky="ew")
+                self.cells.append(cell)
+
+    @property
+    def total_pages(self):
+        per_page = self.rows_per_column * self.columns_per_page
+        return max(1, (len(self.items) + per_page - 1) // per_page)
+
+    @timed("gui.set_items")
+    def set_items(self, items, width=None):
+        self.items = items
+        self.width = width
+        pages = self.total_pages if self.total_pages > 1 else 0
+        if pages != len(self.page_buttons):
+            for button in self.page_buttons:
+                button.destroy()
+            self.page_buttons = [
+                tb.Button(self.page_buttons_frame, text=str(p + 1), bootstyle="secondary",
+                          command=lambda p=p: (begin_interaction(f"Page {p + 1}"), self.show_page(p)))
+                for p in range(pages)
+            ]
+            for button in self.page_buttons:
+                button.pack(side="left", padx=5)
+
+    @timed("gui.show_page")
+    def show_page(self, page):
+        self.page = max(0, min(page, self.total_pages - 1))
+        if self.on_page:
+            self.on_page(self.page)
+
+        if self.items:
+            self.empty_label.pack_forget()
+        else:
+            self.empty_label.pack(pady=20, before=self.page_bar)
+
+        start = self.page * self.rows_per_column * self.columns_per_page
+        for col, col_frame in enumerate(self.column_frames):
+            if start + col * self.rows_per_column < len(self.items):
+                col_frame.grid(row=0, column=col, padx=20, sticky="n")
+            else:
+                col_frame.grid_remove()
+        for offset, cell in enumerate(self.cells):
+            idx = start + offset
+            if idx < len(self.items):
+                if self.width:
+                    cell.configure(width=self.width)
+                self.bind_cell(cell, self.items[idx])
+                cell.grid()
+            else:
+                cell.grid_remove()
+
+        for p, button in enumerate(self.page_buttons):
+            button.configure(bootstyle="primary" if p == self.page else "secondary")
 
 def show_series_list():
+    begin_interaction("Plan Series")
     clear_window()
     root.title("Plan Series")
 
     tb.Label(root, text="Series Planner", font=("Segoe UI", 18, "bold")).pack(pady=15)
 
-    full_series_data = analyze_schedule()
-    filtered_data = full_series_data.copy()
+    full_series_data = []
+    filtered_data = []
+    ready = False
 
     filter_frame = tb.Frame(root)
     filter_frame.pack(fill="x", pady=5)
@@ -242,17 +428,11 @@ def show_series_list():
     class_box.grid(row=0, column=3, padx=5)
 
     tb.Label(filter_frame, text="Series:").grid(row=0, column=4, padx=5)
-    series_names = ["All"] + [name for name, _ in full_series_data]
-    series_box = tb.Combobox(filter_frame, textvariable=selected_series, values=series_names, state="readonly", width=25)
+    series_box = tb.Combobox(filter_frame, textvariable=selected_series, values=["All"], state="readonly", width=25)
     series_box.grid(row=0, column=5, padx=5)
 
     tb.Label(filter_frame, text="Car:").grid(row=0, column=6, padx=5)
-    car_conn = sqlite3.connect(CARS_DB)
-    c_cursor = car_conn.cursor()
-    c_cursor.execute("SELECT name FROM cars ORDER BY name")
-    all_cars = ["All"] + [row[0] for row in c_cursor.fetchall()]
-    car_conn.close()
-    car_box = tb.Combobox(filter_frame, textvariable=selected_car, values=all_cars, state="readonly", width=20)
+    car_box = tb.Combobox(filter_frame, textvariable=selected_car, values=["All"], state="readonly", width=20)
     car_box.grid(row=0, column=7, padx=5)
 
     tb.Label(filter_frame, text="Week:").grid(row=0, column=8, padx=5)
@@ -265,25 +445,27 @@ def show_series_list():
         selected_series.set("All")
         selected_car.set("All")
         selected_week.set("All")
-        filtered_data[:] = full_series_data
-        update_list()
+        DB_WORKER.cancel("planner")
+        search_text.set("")
+        show_results(list(full_series_data))
         for key in FILTER_STATE:
             FILTER_STATE[key] = "All"
         FILTER_STATE["active"] = False
 
     tb.Button(filter_frame, text="Reset", bootstyle='secondary', command=reset_filters).grid(row=0, column=10, padx=10)
 
-    container = tb.Frame(root)
-    container.pack(fill="both", expand=True, padx=10, pady=5)
+    search_frame = tb.Frame(root)
+    search_frame.pack(pady=5)
+    search_text = tk.StringVar()
+    search_hits = None      # table names matching the search box, None while it is empty
+    tb.Label(search_frame, text="🔍 Serie, Strecke oder Auto:").pack(side="left", padx=5)
+    tb.Entry(search_frame, textvariable=search_text, width=40).pack(side="left", padx=5)
 
-    canvas = tk.Canvas(container, highlightthickness=0, bg=BG_COLOR)
-    scrollbar = ttk.Scrollbar(container, orient="vertical", command=canvas.yview)
-    scrollable_frame = tb.Frame(canvas)
+    loading_label = tb.Label(root, text="⏳ Lade Serien...", font=("Segoe UI", 10))
+    loading_label.pack()
 
-    window_id = canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
-    canvas.configure(yscrollcommand=scrollbar.set)
-    canvas.pack(side="left", fill="both", expand=True)
-    scrollbar.pack(side="right", fill="y")
+    container = tb.Frame(root)
+    container.pack(fill="both", expand=True, padx=10, pady=5)
 
     def save_filter_state():
         FILTER_STATE.update({
@@ -295,144 +477,117 @@ def show_series_list():
             "active": True
         })
 
-    def update_list():
+    def set_page(page):
         global CURRENT_PAGE
-        for widget in container.winfo_children():
-            widget.destroy()
+        CURRENT_PAGE = page
+
+    def bind_series(cell, item):
+        series_name, weeks = item
+        cell.configure(text=f"{series_name}  ({len(weeks)} Wochen)",
+                       command=lambda: (save_filter_state(), show_series_detail(series_name)))
 
-        if not filtered_data:
-            tb.Label(container, text="Keine fahrbaren Serien gefunden.", bootstyle="danger").pack(pady=20)
+    grid = VirtualGrid(container, lambda parent: tb.Button(parent, bootstyle="danger", padding=(10, 5)),
+                       bind_series, cell_pady=5, empty_text="Keine fahrbaren Serien gefunden.", on_page=set_page)
+
+    @timed("gui.update_list")
+    def update_list():
+        items = filtered_data if search_hits is None else [item for item in filtered_data if item[0] in search_hits]
+        width = max((len(f"{series_name}  ({len(weeks)} Wochen)") for series_name, weeks in items), default=0) + 2
+        grid.set_items(items, width)
+        grid.show_page(CURRENT_PAGE)
+
+    def show_search(hits):
+        nonlocal search_hits
+        if not container.winfo_exists():
             return
+        search_hits = hits
+        set_page(0)
+        update_list()
 
-        max_width_chars = max(len(f"{series_name}  ({len(weeks)} Wochen)") for series_name, weeks in filtered_data)
-        button_width = max_width_chars + 2
-        max_rows_per_column = 20
-        total_columns = (len(filtered_data) + max_rows_per_column - 1) // max_rows_per_column
-
-        columns_per_page = 3
-        total_pages = (total_columns + columns_per_page - 1) // columns_per_page
-
-        current_page = min(CURRENT_PAGE, total_pages - 1)
-        start_col = current_page * columns_per_page
-        end_col = min(start_col + columns_per_page, total_columns)
-
-        columns_frame = tb.Frame(container)
-        columns_frame.pack(expand=True)
-
-        for col_idx in range(start_col, end_col):
-            col_frame = tb.Frame(columns_frame)
-            col_frame.pack(side="left", padx=20)
-
-            for row in range(max_rows_per_column):
-                idx = col_idx * max_rows_per_column + row
-                if idx >= len(filtered_data):
-                    break
-                series_name, weeks = filtered_data[idx]
-                tb.Button(
-                    col_frame,
-                    text=f"{series_name}  ({len(weeks)} Wochen)",
-                    width=button_width,
-                    bootstyle="danger",
-                    padding=(10, 5),
-                    command=lambda s=series_name, w=weeks: (save_filter_state(), show_series_detail(s, w))
-                ).pack(pady=5, fill="x")
-
-        if total_pages > 1:
-            page_frame = tb.Frame(container)
-            page_frame.pack(pady=10)
-            for p in range(total_pages):
-                style = 'primary' if p == current_page else 'secondary'
-                tb.Button(page_frame, text=str(p+1), bootstyle=style,
-                        command=lambda p=p: (set_page(p), update_list())).pack(side="left", padx=5)
+    def run_search(*_args):
+        text = search_text.get().strip()
+        if not text:
+            DB_WORKER.cancel("search")
+            show_search(None)
+            return
+        begin_interaction("Search")
+        # Each keystroke supersedes the previous lookup
+        DB_WORKER.submit(lambda: get_schedule_model().search_series(text), on_done=show_search, key="search")
 
-    def set_page(page):
-        global CURRENT_PAGE
-        CURRENT_PAGE = page
+    search_text.trace_add("write", run_search)
 
-    def apply_filters():
+    def show_results(data):
         nonlocal filtered_data
-        filtered_data = []
-
-        for series_name, weeks in full_series_data:
-            include = True
-            conn = sqlite3.connect(SCHEDULE_DB)
-            cur = conn.cursor()
-
-            cur.execute(f"SELECT class FROM '{series_name}' WHERE class IS NOT NULL LIMIT 1")
-            row = cur.fetchone()
-            series_class = row[0] if row else ""
-
-            cur.execute(f"SELECT license FROM '{series_name}' WHERE license IS NOT NULL LIMIT 1")
-            row = cur.fetchone()
-            series_license = row[0] if row else ""
-
-            if selected_category.get() != "All" and (not series_class or selected_category.get().lower() not in series_class.lower()):
-                include = False
-
-            if selected_class.get() != "All" and (not series_license or selected_class.get().upper() != series_license.upper()):
-                include = False
-
-            if selected_series.get() != "All" and selected_series.get().lower() not in series_name.lower():
-                include = False
-
-            if selected_week.get() != "All":
-                try:
-                    week_num = int(selected_week.get())
-                    if week_num not in weeks:
-                        include = False
-                except ValueError:
-                    pass
-
-            if selected_car.get() != "All":
-                cur.execute(f"SELECT cars FROM '{series_name}' WHERE cars IS NOT NULL")
-                rows = cur.fetchall()
-                all_cars_in_series = set()
-                for row in rows:
-                    if row[0]:
-                        for car in row[0].splitlines():
-                            all_cars_in_series.add(car.strip())
-                if not any(selected_car.get().lower() in c.lower() for c in all_cars_in_series):
-                    include = False
-
-            conn.close()
-
-            if include:
-                filtered_data.append((series_name, weeks))
-
+        if not container.winfo_exists():
+            return
+        filtered_data = data
+        loading_label.config(text="")
         update_list()
 
+    def apply_filters():
+        if not ready:
+            return
+        begin_interaction("Apply Filters")
+        filters = {
+            "category": selected_category.get(),
+            "class": selected_class.get(),
+            "series": selected_series.get(),
+            "car": selected_car.get(),
+            "week": selected_week.get(),
+        }
+        loading_label.config(text="⏳ Filtere...")
+        # Clicking again cancels a filter run that has not delivered yet
+        DB_WORKER.submit(lambda: filter_series(full_series_data, filters, get_schedule_model()),
+                         on_done=show_results, on_error=show_job_error(loading_label), key="planner")
+
+    def loaded(result):
+        nonlocal ready
+        data, car_names = result
+        if not container.winfo_exists():
+            return
+        full_series_data[:] = data
+        ready = True
+        series_box.configure(values=["All"] + [name for name, _ in data])
+        car_box.configure(values=["All"] + car_names)
+        if FILTER_STATE["active"]:
+            apply_filters()
+        else:
+            show_results(list(data))
+
+    for box in (category_box, class_box, series_box, car_box, week_box):
+        box.bind("<<ComboboxSelected>>", lambda e: apply_filters())
+
     tb.Button(filter_frame, text="Apply Filters", bootstyle='danger', command=apply_filters).grid(row=0, column=11, padx=5)
     tb.Button(root, text="⬅ Back", bootstyle='secondary', command=show_main_menu).pack(side="bottom", pady=10)
 
-    if FILTER_STATE["active"]:
-        apply_filters()
+    DB_WORKER.submit(lambda: (analyze_schedule(), [name for _id, name, _licensed, _price in read_catalog("cars")]),
+                     on_done=loaded, on_error=show_job_error(loading_label), key="planner-load")
 
-def show_series_detail(series_name, weeks):
+def show_series_detail(series_name, back=None):
+    begin_interaction("Series Detail")
     clear_window()
     tb.Label(root, text=f"{series_name} – Fahrbare Wochen", font=("Segoe UI", 16, "bold"), bootstyle="danger").pack(pady=10)
     container = tb.Frame(root)
     container.pack(fill="both", expand=True, padx=20, pady=10)
     container.columnconfigure(0, weight=1)
 
-    conn = sqlite3.connect(SCHEDULE_DB)
-    cursor = conn.cursor()
-    cursor.execute(f"SELECT rowid, cars, track FROM '{series_name}'")
-    all_weeks = {rowid: (cars, track) for rowid, cars, track in cursor.fetchall()}
-    conn.close()
+    loading_label = tb.Label(container, text="⏳ Lade...", font=("Segoe UI", 10))
+    loading_label.grid(row=0, column=0, pady=10)
 
-    licensed_cars = set(get_licensed_names(CARS_DB, "cars"))
-    licensed_tracks = set(get_licensed_names(TRACKS_DB, "tracks"))
+    def load():
+        model = get_schedule_model()
+        return model.driveable_weeks(series_name), model.licensed_cars_for(series_name)
 
-    weeks_display = []
-    series_cars_all = set()
+    DB_WORKER.submit(load, on_done=lambda result: show_weeks(container, *result),
+                     on_error=show_job_error(loading_label), key="detail")
+    tb.Button(root, text="⬅ Back", bootstyle='secondary', command=back or show_series_list).pack(side="bottom", pady=10)
 
-    for w, (cars_str, track_name) in all_weeks.items():
-        cars_in_week = set()
-        if cars_str:
-            cars_in_week = {c.strip() for c in cars_str.splitlines() if c.strip()}
-            series_cars_all.update(cars_in_week)
-        if track_name and track_name in licensed_tracks:
-            weeks_display.append((w, track_name))
+@timed("gui.show_weeks")
+def show_weeks(container, weeks_display, licensed_cars_for_series):
+    if not container.winfo_exists():
+        return
+    for widget in container.winfo_children():
+        widget.destroy()
 
     row_idx = 0
     if not weeks_display:
@@ -446,7 +601,6 @@ def show_series_detail(series_name, weeks):
     tb.Label(container, text="Deine Autos für diese Serie:", font=("Segoe UI", 12, "bold"), bootstyle="danger").grid(row=row_idx, column=0, pady=15)
     row_idx += 1
 
-    licensed_cars_for_series = sorted([c for c in series_cars_all if c in licensed_cars])
     if licensed_cars_for_series:
         for car in licensed_cars_for_series:
             tb.Label(container, text=f"✅ {car}", font=("Segoe UI", 10)).grid(row=row_idx, column=0, pady=3)
@@ -454,9 +608,204 @@ def show_series_detail(series_name, weeks):
     else:
         tb.Label(container, text="❌ Keine passenden Autos lizenziert", bootstyle="danger").grid(row=row_idx, column=0, pady=5)
 
-    tb.Button(root, text="⬅ Back", bootstyle='secondary', command=show_series_list).pack(side="bottom", pady=10)
+COVERAGE_COLORS = {
+    COVERAGE_OWNED: ("#5cb85c", "Fahrbar"),
+    COVERAGE_NO_TRACK: ("#f0ad4e", "Strecke fehlt"),
+    COVERAGE_NO_CAR: ("#d9534f", "Auto fehlt"),
+    COVERAGE_NO_CAR_TRACK: ("#6b2020", "Auto & Strecke fehlen"),
+}
+COVERAGE_NAME_WIDTH = 340
+COVERAGE_CELL_W, COVERAGE_CELL_H = 44, 20
+PLAN_OUTLINE = "#ffffff"
+
+# 🔹 Season plan: only touched on the database worker, so ownership changes can re-solve it in order.
+# The overview reads it through job results and changes it through jobs that are never cancelled.
+SEASON_PLAN = {"preferred": [], "sessions": 1, "planner": None}
+
+def season_planner():
+    planner = SEASON_PLAN["planner"]
+    model = get_schedule_model()
+    if planner is None or planner.model is not model:
+        planner = SEASON_PLAN["planner"] = SeasonPlanner(model, SEASON_PLAN["preferred"], SEASON_PLAN["sessions"])
+    return planner
+
+def set_season_preferences(toggle=None, sessions=None):
+    """Add or remove the series `toggle` from the preferred ones and/or set the races per week"""
+    if toggle is not None:
+        preferred = [name for name in SEASON_PLAN["preferred"] if name != toggle]
+        if len(preferred) == len(SEASON_PLAN["preferred"]):
+            preferred.append(toggle)
+        SEASON_PLAN["preferred"] = preferred
+    if sessions is not None:
+        SEASON_PLAN["sessions"] = sessions
+    SEASON_PLAN["planner"] = None
+
+def update_season_planner(changed_cars, changed_tracks):
+    planner = SEASON_PLAN["planner"]
+    if planner is not None:
+        changed_weeks = planner.update(changed_cars, changed_tracks)
+        log.debug("Season plan re-solved for weeks %s", changed_weeks)
+
+OWNERSHIP_LISTENERS.append(update_season_planner)
+
+def show_season_overview():
+    """Series x week coverage of the whole season, drawn on one canvas"""
+    begin_interaction("Season Overview")
+    clear_window()
+    root.title("Season Overview")
+
+    tb.Label(root, text="Season Overview", font=("Segoe UI", 18, "bold")).pack(pady=15)
+
+    legend = tb.Frame(root)
+    legend.pack(pady=5)
+    for color, text in COVERAGE_COLORS.values():
+        tk.Label(legend, text="  ", bg=color).pack(side="left", padx=(12, 4))
+        tb.Label(legend, text=text).pack(side="left")
+
+    controls = tb.Frame(root)
+    controls.pack(pady=5)
+    tb.Label(controls, text="Rennen pro Woche:").pack(side="left", padx=5)
+    sessions = tk.StringVar()
+    sessions_box = tb.Combobox(controls, textvariable=sessions, values=[str(i) for i in range(1, 6)],
+                               state="readonly", width=3)
+    sessions_box.pack(side="left", padx=5)
+    tb.Label(controls, text="Saisonstart:").pack(side="left", padx=(15, 5))
+    season_start = tk.StringVar(value=datetime.date.today().isoformat())
+    tb.Entry(controls, textvariable=season_start, width=11).pack(side="left", padx=5)
+    tb.Button(controls, text="📄 Export CSV", bootstyle="secondary", command=lambda: export("csv")).pack(side="left", padx=5)
+    tb.Button(controls, text="📅 Export iCal", bootstyle="secondary", command=lambda: export("ics")).pack(side="left", padx=5)
+
+    hover_label = tb.Label(root, text="⏳ Lade Saison...", font=("Segoe UI", 10))
+    hover_label.pack(pady=5)
+    tb.Button(root, text="⬅ Back", bootstyle="secondary", command=show_main_menu).pack(side="bottom", pady=10)
+
+    frame = tb.Frame(root)
+    frame.pack(fill="both", expand=True, padx=20, pady=5)
+    canvas = tk.Canvas(frame, bg=BG_COLOR, highlightthickness=0)
+    scrollbar = tb.Scrollbar(frame, orient="vertical", command=canvas.yview)
+    canvas.configure(yscrollcommand=scrollbar.set)
+    scrollbar.pack(side="right", fill="y")
+    canvas.pack(side="left", fill="both", expand=True)
+    canvas.bind("<MouseWheel>", lambda e: canvas.yview_scroll(-1 if e.delta > 0 else 1, "units"))
+
+    order = []
+
+    def cell_at(event):
+        x, y = canvas.canvasx(event.x), canvas.canvasy(event.y)
+        row = int(y // COVERAGE_CELL_H) - 1
+        week = int((x - COVERAGE_NAME_WIDTH) // COVERAGE_CELL_W) + 1 if x >= COVERAGE_NAME_WIDTH else None
+        if 0 <= row < len(order):
+            return order[row], week
+        return None, None
+
+    @timed("gui.draw_coverage")
+    def draw(result):
+        series_names, rows, series_weeks, planned, preferred, session_count = result
+        if not canvas.winfo_exists():
+            return
+        sessions.set(str(session_count))
+        canvas.delete("all")
+        order[:] = sorted(range(len(series_names)),
+                          key=lambda i: (i not in preferred, -rows[i].count(COVERAGE_OWNED), series_names[i]))
+        for week in range(1, COVERAGE_WEEKS + 1):
+            canvas.create_text(COVERAGE_NAME_WIDTH + (week - 0.5) * COVERAGE_CELL_W, COVERAGE_CELL_H / 2,
+                               text=str(week), fill="white", font=("Segoe UI", 9, "bold"))
+        for line, idx in enumerate(order, start=1):
+            top = line * COVERAGE_CELL_H
+            canvas.create_text(4, top + COVERAGE_CELL_H / 2, text=("★ " if idx in preferred else "") + series_names[idx],
+                               anchor="w", fill="white", font=("Segoe UI", 9))
+            for week, status in enumerate(rows[idx]):
+                if status in COVERAGE_COLORS:
+                    left = COVERAGE_NAME_WIDTH + week * COVERAGE_CELL_W
+                    is_planned = (idx, week + 1) in planned
+                    canvas.create_rectangle(left + 1, top + 1, left + COVERAGE_CELL_W - 1, top + COVERAGE_CELL_H - 1,
+                                            fill=COVERAGE_COLORS[status][0], outline=PLAN_OUTLINE,
+                                            width=2 if is_planned else 0)
+        canvas.configure(scrollregion=(0, 0, COVERAGE_NAME_WIDTH + COVERAGE_WEEKS * COVERAGE_CELL_W,
+                                       (len(order) + 1) * COVERAGE_CELL_H))
+        hover_label.config(text=f"{len(planned)} Rennen geplant (weiß umrandet). Klick zeigt die Details, "
+                                "Rechtsklick markiert eine Serie als bevorzugt.")
+
+        def on_motion(event):
+            idx, week = cell_at(event)
+            if idx is None:
+                return
+            text = series_names[idx]
+            track = next((t for w, _track_id, t in series_weeks[idx] if w == week), None)
+            if track:
+                status = rows[idx][week - 1]
+                text += f" – Week {week}: {track} ({COVERAGE_COLORS[status][1]})"
+                if (idx, week) in planned:
+                    text += " – geplant"
+            hover_label.config(text=text)
+
+        def on_click(event):
+            idx, _week = cell_at(event)
+            if idx is not None:
+                show_series_detail(series_names[idx], back=show_season_overview)
+
+        def on_right_click(event):
+            idx, _week = cell_at(event)
+            if idx is None:
+                return
+            begin_interaction("Toggle Preferred Series")
+            name = series_names[idx]
+            DB_WORKER.submit(lambda: replan(toggle=name), on_done=draw, on_error=show_job_error(hover_label))
+
+        canvas.bind("<Motion>", on_motion)
+        canvas.bind("<Button-1>", on_click)
+        canvas.bind("<Button-3>", on_right_click)
+
+    def load():
+        model = get_schedule_model()
+        planner = season_planner()
+        planned = {(idx, week) for week, picks in planner.weeks.items() for idx in picks}
+        return (list(model.series_names), planner.rows, model.series_weeks, planned, set(planner.rank),
+                planner.sessions_per_week)
+
+    def replan(**preferences):
+        set_season_preferences(**preferences)
+        return load()
+
+    def change_sessions(_event=None):
+        begin_interaction("Season Sessions")
+        count = int(sessions.get())
+        DB_WORKER.submit(lambda: replan(sessions=count), on_done=draw, on_error=show_job_error(hover_label))
+
+    def export(kind):
+        try:
+            start = datetime.date.fromisoformat(season_start.get().strip())
+        except ValueError:
+            hover_label.config(text="❌ Saisonstart bitte als JJJJ-MM-TT angeben.")
+            return
+        path = filedialog.asksaveasfilename(defaultextension=f".{kind}", initialfile=f"season_plan.{kind}",
+                                            filetypes=[("iCalendar", "*.ics")] if kind == "ics" else [("CSV", "*.csv")])
+        if not path:
+            return
+
+        def write():
+            planner = season_planner()
+            with open(path, "w", encoding="utf-8", newline="") as f:
+                if kind == "ics":
+                    write_season_ical(planner.races(), f, start, planner.model.version)
+                else:
+                    write_season_csv(planner.races(), f)
+
+        def done(_result):
+            if hover_label.winfo_exists():
+                hover_label.config(text=f"✅ Saisonplan gespeichert: {path}")
+
+        def failed(error):
+            if hover_label.winfo_exists():
+                hover_label.config(text=f"❌ Export fehlgeschlagen: {error}")
+
+        DB_WORKER.submit(write, on_done=done, on_error=failed)
+
+    sessions_box.bind("<<ComboboxSelected>>", change_sessions)
+    DB_WORKER.submit(load, on_done=draw, on_error=show_job_error(hover_label), key="overview")
 
 def show_content_menu():
+    begin_interaction("Select Content")
     clear_window()
     root.title("Select Content")
 
@@ -474,196 +823,207 @@ def show_content_menu():
     status_label = tb.Label(save_frame, text="", font=("Segoe UI", 10), foreground="#5cb85c", background=BG_COLOR)
     status_label.pack(side="left", padx=10)
 
+    saved_state = {}    # (kind, id) -> licensed as stored in the database
+    dirty = set()
+    autosave_job = None
+
+    def mark_dirty(kind, item_id):
+        nonlocal autosave_job
+        dirty.add((kind, item_id))
+        if autosave_job is not None:
+            root.after_cancel(autosave_job)
+        autosave_job = root.after(AUTOSAVE_DELAY_MS, save_selection)
+
+    def collect_changes(kinds=("cars", "tracks")):
+        """Move dirty toggles of the given kinds into saved_state and return them as {id: licensed}"""
+        changes = {"cars": {}, "tracks": {}}
+        for kind, item_id in [key for key in dirty if key[0] in kinds]:
+            dirty.discard((kind, item_id))
+            value = (car_vars if kind == "cars" else track_vars)[item_id].get()
+            if value != saved_state[(kind, item_id)]:
+                changes[kind][item_id] = value
+                saved_state[(kind, item_id)] = value
+        return changes["cars"], changes["tracks"]
+
     def save_selection():
-        # Cars
-        conn = sqlite3.connect(CARS_DB)
-        cur = conn.cursor()
-        for car_id, var in car_vars.items():
-            cur.execute("UPDATE cars SET licensed = ? WHERE id = ?", (1 if var.get() else 0, car_id))
-        conn.commit()
-        conn.close()
+        nonlocal autosave_job
+        if autosave_job is not None:
+            root.after_cancel(autosave_job)
+            autosave_job = None
+
+        def finish(_result):
+            if status_label.winfo_exists():
+                status_label.config(text="✅ Saved!")
+
+        changes = collect_changes()
+        show_error = show_job_error(status_label, "❌ Speichern fehlgeschlagen")
+
+        def failed(error):
+            # Put the toggles back into dirty so the next save (or exit) writes them again
+            for kind, kind_changes in zip(("cars", "tracks"), changes):
+                for item_id, value in kind_changes.items():
+                    if saved_state[(kind, item_id)] == value:
+                        saved_state[(kind, item_id)] = not value
+                        dirty.add((kind, item_id))
+            show_error(error)
 
-        # Tracks
-        conn = sqlite3.connect(TRACKS_DB)
-        cur = conn.cursor()
-        for track_id, var in track_vars.items():
-            cur.execute("UPDATE tracks SET licensed = ? WHERE id = ?", (1 if var.get() else 0, track_id))
-        conn.commit()
-        conn.close()
+        # Jobs run in order, so screens opened after leaving already see this write
+        DB_WORKER.submit(save_ownership_changes, *changes, on_done=finish, on_error=failed)
 
-        status_label.config(text="✅ Saved!")
-        save_frame.update_idletasks()
+    def save_pending():
+        if dirty:
+            save_selection()
 
+    global PENDING_SAVE
+    PENDING_SAVE = save_pending
 
-    tb.Button(root, text="⬅ Back", bootstyle="secondary", width=20, command=show_main_menu).pack(side="bottom", pady=10)
+    def leave():
+        save_pending()
+        show_main_menu()
+
+    tb.Button(root, text="⬅ Back", bootstyle="secondary", width=20, command=leave).pack(side="bottom", pady=10)
 
     car_vars = {}
-    car_conn = sqlite3.connect(CARS_DB)
-    c_cursor = car_conn.cursor()
-    c_cursor.execute("SELECT id, name, licensed FROM cars ORDER BY name")
     cars = []
-    for car_id, car_name, licensed in c_cursor.fetchall():
-        var = tk.BooleanVar(value=bool(licensed))
-        car_vars[car_id] = var
-        cars.append((car_id, car_name))
-    car_conn.close()
-
     track_vars = {}
-    track_conn = sqlite3.connect(TRACKS_DB)
-    t_cursor = track_conn.cursor()
-    t_cursor.execute("SELECT id, name, licensed, price FROM tracks ORDER BY name")
     tracks = []
-    for track_id, track_name, licensed, price in t_cursor.fetchall():
-        var = tk.BooleanVar(value=bool(licensed))
-        track_vars[track_id] = var
-        display_name = f"{track_name} ({price})" if price else track_name
-        tracks.append((track_id, display_name))
-    track_conn.close()
+
+    def loaded(result):
+        car_rows, track_rows = result
+        if not container.winfo_exists():
+            return
+        for car_id, car_name, licensed, _price in car_rows:
+            var = tk.BooleanVar(value=bool(licensed))
+            var.trace_add("write", lambda *_args, i=car_id: mark_dirty("cars", i))
+            car_vars[car_id] = var
+            saved_state[("cars", car_id)] = bool(licensed)
+            cars.append((car_id, car_name))
+
+        for track_id, track_name, licensed, price in track_rows:
+            var = tk.BooleanVar(value=bool(licensed))
+            var.trace_add("write", lambda *_args, i=track_id: mark_dirty("tracks", i))
+            track_vars[track_id] = var
+            saved_state[("tracks", track_id)] = bool(licensed)
+            display_name = f"{track_name} ({price})" if price else track_name
+            tracks.append((track_id, display_name))
+
+        refresh_items()
 
     current_view = tk.StringVar(value="Cars")
 
-    def render_items(items, selected_vars, title=""):
-        max_rows_per_column = 20
-        total_columns = (len(items) + max_rows_per_column - 1) // max_rows_per_column
-        columns_per_page = 3
-        total_pages = (total_columns + columns_per_page - 1) // columns_per_page
-        current_page = 0
-
-        page_frame_ref = None
-
-        def draw_page(page):
-            nonlocal current_page, page_frame_ref
-            current_page = page
-
-            for widget in container.winfo_children():
-                widget.destroy()
-
-            columns_frame = tb.Frame(container)
-            columns_frame.pack(expand=True)
-
-            start_col = page * columns_per_page
-            end_col = min(start_col + columns_per_page, total_columns)
-
-            max_width_chars = max(len(name) for _id, name in items)
-            button_width = max_width_chars + 2
-
-            for col_idx in range(start_col, end_col):
-                col_frame = tb.Frame(columns_frame)
-                col_frame.pack(side="left", padx=20)
-
-                for row in range(max_rows_per_column):
-                    idx = col_idx * max_rows_per_column + row
-                    if idx >= len(items):
-                        break
-                    _id, name = items[idx]
-                    var = selected_vars[_id]
-                    tb.Checkbutton(
-                        col_frame,
-                        text=name,
-                        variable=var,
-                        bootstyle="success-round-toggle",
-                        width=button_width,
-                        padding=(5,3)
-                    ).pack(pady=3, fill="x")
-
-            if page_frame_ref is not None:
-                page_frame_ref.destroy()
-
-            if total_pages > 1 or True:
-                page_frame_ref = tb.Frame(container)
-                page_frame_ref.pack(pady=10)
-
-                if total_pages > 1:
-                    for p in range(total_pages):
-                        style = 'primary' if p == current_page else 'secondary'
-                        tb.Button(page_frame_ref, text=str(p+1), bootstyle=style,
-                                command=lambda p=p: draw_page(p)).pack(side="left", padx=5)
-
-                toggle_text = "Switch to Tracks" if current_view.get() == "Cars" else "Switch to Cars"
-                tb.Button(page_frame_ref, text=toggle_text, bootstyle="warning",
-                        command=toggle_view).pack(side="left", padx=20)
-
-                reset_text = "Reset to Free Cars" if current_view.get() == "Cars" else "Reset to Free Tracks"
-                tb.Button(page_frame_ref, text=reset_text, bootstyle="secondary-outline",
-                        command=reset_to_free).pack(side="left", padx=5)
-
-        def reset_to_free():
-            if current_view.get() == "Cars":
-                conn = sqlite3.connect(CARS_DB)
-                cur = conn.cursor()
-
-                cur.execute("UPDATE cars SET licensed = 0")
-
-                cur.execute("UPDATE cars SET licensed = 1 WHERE price IS NULL OR price = '' OR price = 'Free'")
-                conn.commit()
-                conn.close()
-
-                for car_id in car_vars:
-                    car_vars[car_id].set(False)
-                cur_list = conn = sqlite3.connect(CARS_DB)
-                c = cur_list.cursor()
-                c.execute("SELECT id FROM cars WHERE price IS NULL OR price = '' OR price = 'Free'")
-                for (cid,) in c.fetchall():
-                    if cid in car_vars:
-                        car_vars[cid].set(True)
-                conn.close()
-                render_items(cars, car_vars, title="Cars")
-
-            else:  # Tracks
-                conn = sqlite3.connect(TRACKS_DB)
-                cur = conn.cursor()
-                cur.execute("UPDATE tracks SET licensed = 0")
-                cur.execute("UPDATE tracks SET licensed = 1 WHERE price IS NULL OR price = '' OR price = 'Free'")
-                conn.commit()
-                conn.close()
-                for track_id in track_vars:
-                    track_vars[track_id].set(False)
-                conn = sqlite3.connect(TRACKS_DB)
-                c = conn.cursor()
-                c.execute("SELECT id FROM tracks WHERE price IS NULL OR price = '' OR price = 'Free'")
-                for (tid,) in c.fetchall():
-                    if tid in track_vars:
-                        track_vars[tid].set(True)
-                conn.close()
-                render_items(tracks, track_vars, title="Tracks")
-
-
-        draw_page(0)
+    def bind_item(cell, item):
+        _id, name = item
+        selected_vars = car_vars if current_view.get() == "Cars" else track_vars
+        cell.configure(text=name, variable=selected_vars[_id])
+
+    grid = VirtualGrid(container, lambda parent: tb.Checkbutton(parent, bootstyle="success-round-toggle", padding=(5, 3)),
+                       bind_item, cell_pady=3)
+    toggle_button = tb.Button(grid.page_bar, bootstyle="warning", command=lambda: toggle_view())
+    toggle_button.pack(side="left", padx=20)
+    reset_button = tb.Button(grid.page_bar, bootstyle="secondary-outline", command=lambda: reset_to_free())
+    reset_button.pack(side="left", padx=5)
+    search_text = tk.StringVar()
+    tb.Label(grid.page_bar, text="🔍").pack(side="left", padx=(20, 5))
+    tb.Entry(grid.page_bar, textvariable=search_text, width=30).pack(side="left")
+
+    def render_items(items):
+        toggle_button.config(text="Switch to Tracks" if current_view.get() == "Cars" else "Switch to Cars")
+        reset_button.config(text="Reset to Free Cars" if current_view.get() == "Cars" else "Reset to Free Tracks")
+        grid.set_items(items, max((len(name) for _id, name in items), default=0) + 2)
+        grid.show_page(0)
+
+    def refresh_items(*_args):
+        """Show the current view, narrowed to the search box matches if it is filled"""
+        items = cars if current_view.get() == "Cars" else tracks
+        text = search_text.get().strip()
+        if not text:
+            DB_WORKER.cancel("content-search")
+            render_items(items)
+            return
+        kind = "cars" if current_view.get() == "Cars" else "tracks"
+
+        def show_matches(ids):
+            if not container.winfo_exists() or kind != ("cars" if current_view.get() == "Cars" else "tracks"):
+                return
+            names = dict(items)
+            render_items([(item_id, names[item_id]) for item_id in ids if item_id in names])
+
+        begin_interaction("Search")
+        DB_WORKER.submit(lambda: get_schedule_model().search_catalog(kind, text), on_done=show_matches,
+                         key="content-search")
+
+    search_text.trace_add("write", refresh_items)
+
+    def reset_to_free():
+        begin_interaction("Reset to Free")
+        kind = "cars" if current_view.get() == "Cars" else "tracks"
+
+        # The job writes the reset and notifies the ownership listeners itself; here only the
+        # checkboxes follow, with saved_state first so the autosave sees nothing to write
+        def done(free_ids):
+            if not container.winfo_exists():
+                return
+            for item_id, var in (car_vars if kind == "cars" else track_vars).items():
+                saved_state[(kind, item_id)] = item_id in free_ids
+                var.set(item_id in free_ids)
+            refresh_items()
+
+        DB_WORKER.submit(reset_ownership_to_free, kind, on_done=done,
+                         on_error=show_job_error(status_label, "❌ Zurücksetzen fehlgeschlagen"))
 
     def toggle_view():
-        if current_view.get() == "Cars":
-            current_view.set("Tracks")
-            render_items(tracks, track_vars, title="Tracks")
-        else:
-            current_view.set("Cars")
-            render_items(cars, car_vars, title="Cars")
+        begin_interaction("Switch View")
+        current_view.set("Tracks" if current_view.get() == "Cars" else "Cars")
+        refresh_items()
 
-    render_items(cars, car_vars, title="Cars")
+    render_items(cars)
+    status_label.config(text="⏳ Lade...")
+    DB_WORKER.submit(lambda: (read_catalog("cars"), read_catalog("tracks")), on_done=loaded,
+                     on_error=show_job_error(status_label), key="content")
 
 
 def show_main_menu():
+    begin_interaction("Main Menu")
     clear_window()
     root.title("iRacing Planner")
 
-    try:
-        logo_img = Image.open("icon.ico")
-        screen_w = root.winfo_screenwidth()
-        logo_img = logo_img.resize((int(screen_w * 0.8), int(screen_w * 0.25)))
-        logo_tk = ImageTk.PhotoImage(logo_img)
-        tb.Label(root, image=logo_tk).pack(pady=20)
-        root.logo_ref = logo_tk
-    except Exception as e:
-        tb.Label(root, text="iRacing Planner", font=("Segoe UI", 22, "bold"), bootstyle="danger", background=BG_COLOR).pack(pady=30)
+    # The logo was resampled during startup; returning to the menu reuses the cached PhotoImage
+    logo_label = tb.Label(root, text="iRacing Planner", font=("Segoe UI", 22, "bold"), bootstyle="danger", background=BG_COLOR)
+    logo_label.pack(pady=20)
+
+    def show_logo(photo):
+        if logo_label.winfo_exists():
+            logo_label.image = photo
+            logo_label.configure(image=photo, text="")
+
+    ASSETS.request(ICON_PATH, LOGO_SIZE, show_logo)
 
     menu = tb.Frame(root)
     menu.pack(pady=30)
 
-    tb.Button(menu, text="🚗 Select Content", bootstyle='danger-outline', width=24, command=show_content_menu).pack(pady=6)
-    tb.Button(menu, text="🏁 Plan Series", bootstyle='danger-outline', width=24, command=show_series_list).pack(pady=6)
-    tb.Button(menu, text="❌ Exit", bootstyle='secondary', width=24, command=root.destroy).pack(pady=6)
+    data_buttons[:] = [
+        tb.Button(menu, text="🚗 Select Content", bootstyle='danger-outline', width=24, command=show_content_menu),
+        tb.Button(menu, text="🏁 Plan Series", bootstyle='danger-outline', width=24, command=show_series_list),
+        tb.Button(menu, text="📅 Season Overview", bootstyle='danger-outline', width=24, command=show_season_overview),
+    ]
+    for button in data_buttons:
+        button.configure(state="normal" if DATA_READY else "disabled")
+        button.pack(pady=6)
+    tb.Button(menu, text="❌ Exit", bootstyle='secondary', width=24, command=exit_app).pack(pady=6)
+
+    global dropped_label
+    dropped_label = tb.Label(root, text=dropped_content_text(), bootstyle="warning", font=("Segoe UI", 10),
+                             wraplength=int(screen_w * 0.6), justify="center")
+    dropped_label.pack(pady=10)
+
 
+# Load cached data in the background and show the main window once it is ready
+threading.Thread(target=prepare_startup, daemon=True).start()
+root.after(20, wait_for_startup)
+root.protocol("WM_DELETE_WINDOW", exit_app)
 
 # Start background update thread
-threading.Thread(target=check_for_updates, daemon=True).start()
+threading.Thread(target=run_update_check, daemon=True).start()
 
 root.mainloop()
+log.debug("Database connections and query timings: %s", database_stats())
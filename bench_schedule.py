@@ -0,0 +1,156 @@
+"""Benchmark the planner hot paths on synthetic schedules from today's size up to 10x the series.
+
+Each scale runs in a fresh process inside its own temporary data directory, so module-level paths
+and caches in schedule_engine start cold. Results go to a JSON file to compare between versions:
+
+    python bench_schedule.py --output bench.json
+    python bench_schedule.py --scales 1 10 --runs 50
+"""
+import sqlite3
+import argparse, json, os, platform, random, shutil, statistics, subprocess, sys, tempfile, time, tracemalloc
+
+# Size of the live data the scales are relative to
+BASE_SERIES = 144
+BASE_CARS = 155
+BASE_TRACKS = 146
+WEEKS = 12
+MAX_CAR_SCALE = 5
+
+CATEGORIES = ["OVAL", "SPORTS CAR", "FORMULA CAR", "DIRT OVAL", "DIRT ROAD", "UNRANKED"]
+LICENSES = ["R", "D", "C", "B", "A"]
+
+def create_catalog(path, table, count_column, names, rng):
+    conn = sqlite3.connect(path)
+    conn.execute(f"""CREATE TABLE "{table}" ("id" INTEGER, "name" TEXT NOT NULL UNIQUE, "{count_column}" TEXT NOT NULL,
+                     "price" TEXT NOT NULL, "licensed" INTEGER, PRIMARY KEY("id" AUTOINCREMENT))""")
+    conn.executemany(f'INSERT INTO "{table}" (name, "{count_column}", price, licensed) VALUES (?, ?, ?, ?)',
+                     [(name, "1", "Free" if rng.random() < 0.15 else rng.choice(["$11.95", "$14.95"]),
+                       1 if rng.random() < 0.3 else 0) for name in names])
+    conn.commit()
+    conn.close()
+
+def generate_data(path, scale, seed=1):
+    """Write cars.db, tracks.db and schedule.db shaped like the published data into path"""
+    rng = random.Random(seed)
+    car_scale = min(scale, MAX_CAR_SCALE)
+    cars = [f"Car {i:04d}" for i in range(BASE_CARS * car_scale)]
+    tracks = [f"Track {i:04d}" for i in range(BASE_TRACKS * car_scale)]
+    os.makedirs(path, exist_ok=True)
+    create_catalog(os.path.join(path, "cars.db"), "cars", "count", cars, rng)
+    create_catalog(os.path.join(path, "tracks.db"), "tracks", "layouts", tracks, rng)
+
+    conn = sqlite3.connect(os.path.join(path, "schedule.db"))
+    for i in range(BASE_SERIES * scale):
+        table = f"Series_{i:05d}_Fixed"
+        conn.execute(f'CREATE TABLE "{table}" (cars TEXT, license TEXT, week INTEGER, track TEXT, class TEXT)')
+        # Like the live data: one car cell per row, some cells with several cars or a "<car> - <variant>" name
+        series_cars = rng.sample(cars, rng.choice([1, 1, 1, 2, 3, 6]))
+        cells = [f"{car} - Variant" if rng.random() < 0.1 else car for car in series_cars]
+        if len(cells) > 2 and rng.random() < 0.5:
+            cells = [cells[0] + "\n" + cells[1]] + cells[2:]
+        rows = []
+        for week in range(1, WEEKS + 1):
+            rows.append((cells[week - 1] if week <= len(cells) else None,
+                         rng.choice(LICENSES) if week == 1 else None, week, rng.choice(tracks),
+                         rng.choice(CATEGORIES) if week == 1 else None))
+        conn.executemany(f'INSERT INTO "{table}" VALUES (?, ?, ?, ?, ?)', rows)
+    conn.commit()
+    conn.close()
+    with open(os.path.join(path, "local_version.txt"), "w", encoding="utf-8") as f:
+        f.write(f"bench-{scale}x")
+    return {"series": BASE_SERIES * scale, "cars": len(cars), "tracks": len(tracks)}
+
+def measure(func, runs, setup=None):
+    """p50/p95 in milliseconds over runs calls, then the peak traced memory of one extra call"""
+    times = []
+    for _ in range(runs):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        func()
+        times.append((time.perf_counter() - start) * 1000)
+    if setup:
+        setup()
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    quantiles = statistics.quantiles(times, n=20, method="inclusive") if len(times) > 1 else times * 19
+    return {"runs": runs, "p50_ms": round(statistics.median(times), 3), "p95_ms": round(quantiles[18], 3),
+            "peak_memory_kb": round(peak / 1024, 1)}
+
+def run_scale(runs):
+    """Time the hot paths against ./data; called in a fresh process per scale"""
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    import schedule_engine as engine
+
+    rng = random.Random(2)
+    results = {}
+    results["build_schedule_snapshot"] = measure(lambda: engine.build_schedule_snapshot(engine.read_local_version()), runs)
+    results["load_schedule_model"] = measure(engine.load_schedule_model, runs)
+    # analyze_schedule answers from the planner cache after its first call, so time the analysis with the
+    # cache emptied before every run and the cached path as its own entry
+    def clear_planner_cache():
+        cache = engine.get_planner_cache()
+        cache.forget()
+        cache.db.execute("DELETE FROM result")
+    model = engine.get_schedule_model()
+    results["model_evaluate"] = measure(lambda: model.evaluate(model.licensed_cars, model.licensed_tracks), runs)
+    results["analyze_schedule"] = measure(engine.analyze_schedule, runs, setup=clear_planner_cache)
+    results["analyze_schedule_cached"] = measure(engine.analyze_schedule, runs)
+
+    series_data = model.results()
+    car_names = sorted(model.car_names.values())
+    filter_sets = [
+        {"category": "OVAL", "class": "All", "series": "All", "car": "All", "week": "All"},
+        {"category": "All", "class": "B", "series": "All", "car": "All", "week": "5"},
+        {"category": "All", "class": "All", "series": "All", "car": rng.choice(car_names), "week": "All"},
+        {"category": "All", "class": "All", "series": "All", "car": "Car 00", "week": "All"},
+    ]
+    for n, filters in enumerate(filter_sets, start=1):
+        results[f"filter_series_{n}"] = measure(lambda: engine.filter_series(series_data, filters, model), runs)
+
+    names = list(model.series_names)
+    results["series_detail"] = measure(
+        lambda: [(model.driveable_weeks(name), model.licensed_cars_for(name)) for name in rng.sample(names, 20)], runs)
+
+    # License restore as done after an update: copy licenses from ./data into a fresh staging copy
+    engine.close_databases()
+    def stage():
+        shutil.rmtree(engine.STAGING_DIR, ignore_errors=True)
+        shutil.copytree(engine.DATA_DIR, engine.STAGING_DIR, ignore=shutil.ignore_patterns("schedule.snap*"))
+    results["carry_over_licenses"] = measure(lambda: engine.carry_over_licenses(engine.DATA_DIR, engine.STAGING_DIR),
+                                             runs, setup=stage)
+    shutil.rmtree(engine.STAGING_DIR, ignore_errors=True)
+    return results
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the planner on synthetic schedules.")
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 2, 5, 10],
+                        help="Series multipliers; cars and tracks grow with them up to 5x")
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--output", default="bench_output.json")
+    parser.add_argument("--run-scale", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.run_scale:
+        json.dump(run_scale(args.runs), sys.stdout)
+        return
+
+    report = {"python": platform.python_version(), "sqlite": sqlite3.sqlite_version, "runs": args.runs, "scales": []}
+    for scale in args.scales:
+        with tempfile.TemporaryDirectory() as tmp:
+            sizes = generate_data(os.path.join(tmp, "data"), scale)
+            out = subprocess.run([sys.executable, os.path.abspath(__file__), "--run-scale", "--runs", str(args.runs)],
+                                 cwd=tmp, capture_output=True, text=True, check=True).stdout
+        results = json.loads(out)
+        report["scales"].append({"scale": scale, **sizes, "results": results})
+        print(f"{scale}x ({sizes['series']} series, {sizes['cars']} cars): "
+              + ", ".join(f"{name} {r['p50_ms']:.2f} ms" for name, r in results.items()))
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=1)
+    print(f"Results written to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Build manifest.json, data.zip.sha256 and the delta/ payloads from data.zip and version.txt.
+
+Run this after replacing data.zip and bumping version.txt, then commit the results:
+
+    python build_manifest.py
+"""
+import sqlite3
+import zipfile, hashlib, json, os, tempfile
+
+from schedule_engine import USER_COLUMNS, table_digest
+
+def table_payload(conn, table):
+    # No table name in the payload: identical tables share one content-addressed file
+    info = [row for row in conn.execute(f"PRAGMA table_info('{table}')") if row[1] not in USER_COLUMNS]
+    columns = [row[1] for row in info]
+    column_list = ", ".join(f'"{c}"' for c in columns)
+    rows = conn.execute(f'SELECT {column_list} FROM "{table}" ORDER BY rowid').fetchall()
+    return {"columns": columns, "types": [row[2] for row in info], "rows": rows}
+
+def main():
+    with open("version.txt", "r", encoding="utf-8") as f:
+        version = f.read().strip()
+
+    manifest = {"version": version, "files": {}, "tables": {}}
+    os.makedirs("delta", exist_ok=True)
+    referenced = set()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        with zipfile.ZipFile("data.zip") as z:
+            z.extractall(tmp)
+
+        for name in sorted(os.listdir(tmp)):
+            path = os.path.join(tmp, name)
+            if not name.endswith(".db"):
+                with open(path, "rb") as f:
+                    content = f.read()
+                digest = hashlib.sha256(content).hexdigest()
+                manifest["files"][name] = digest
+                referenced.add(digest)
+                with open(os.path.join("delta", digest), "wb") as f:
+                    f.write(content)
+                continue
+
+            conn = sqlite3.connect(path)
+            tables = {}
+            for (table,) in conn.execute(
+                    "SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%' ORDER BY rowid").fetchall():
+                digest = table_digest(conn, table)
+                tables[table] = digest
+                referenced.add(f"{digest}.json")
+                with open(os.path.join("delta", f"{digest}.json"), "w", encoding="utf-8") as f:
+                    json.dump(table_payload(conn, table), f, ensure_ascii=False, separators=(",", ":"))
+            conn.close()
+            manifest["tables"][name] = tables
+
+    # Payloads are content-addressed, so anything not referenced by this version is stale
+    for name in os.listdir("delta"):
+        if name not in referenced:
+            os.remove(os.path.join("delta", name))
+
+    with open("manifest.json", "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=1)
+
+    with open("data.zip", "rb") as f:
+        data_sha256 = hashlib.sha256(f.read()).hexdigest()
+    with open("data.zip.sha256", "w", encoding="utf-8") as f:
+        f.write(f"{data_sha256}  data.zip\n")
+
+    print(f"Manifest for v{version}: {len(manifest['files'])} files, "
+          f"{sum(len(t) for t in manifest['tables'].values())} tables")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,1877 @@
+"""GUI-free planning engine for SeriesChecker: data updates, schedule snapshot and ownership model.
+
+Run it directly to print the driveable series for one or more ownership profiles:
+
+    python schedule_engine.py --format json
+    python schedule_engine.py --profile alice.json --profile bob.json --car "GT3" --format csv
+"""
+import sqlite3
+from contextlib import contextmanager
+from logging.handlers import RotatingFileHandler
+from pathlib import Path
+import requests, zipfile, hashlib, shutil, json, logging, argparse, array, bisect, csv, datetime, functools, mmap, os, queue, struct, sys, threading, time, unicodedata
+
+log = logging.getLogger("SeriesChecker")
+
+UPDATE_BASE_URL = os.environ.get("SERIESCHECKER_UPDATE_URL", "https://raw.githubusercontent.com//sutsujepet/SeriesChecker/main")
+
+def resource_path(relative_path):
+    """Return absolute path to resource (works in .exe too)"""
+    base_path = getattr(sys, '_MEIPASS', os.path.dirname(os.path.abspath(__file__)))
+    if relative_path.startswith("data"):
+        base_path = os.path.dirname(os.path.abspath(sys.executable)) if getattr(sys, 'frozen', False) else os.path.abspath(".")
+    return os.path.join(base_path, relative_path)
+
+CARS_DB = resource_path("data/cars.db")
+TRACKS_DB = resource_path("data/tracks.db")
+SCHEDULE_DB = resource_path("data/schedule.db")
+SCHEDULE_SNAPSHOT = resource_path("data/schedule.snap")
+LOCAL_VERSION_FILE = resource_path("data/local_version.txt")
+# User state that must survive data updates lives next to the data directory, not in it
+APP_DIR = os.path.dirname(resource_path("data"))
+PROFILES_DB = os.path.join(APP_DIR, "profiles.db")
+PLANNER_CACHE_DB = os.path.join(APP_DIR, "planner_cache.db")
+UPDATE_STATE_FILE = os.path.join(APP_DIR, "update_state.json")
+
+# 🔹 Timing spans: off unless SERIESCHECKER_PROFILE is set or profiling is switched on at runtime
+PROFILE_LOG_PATH = os.path.join(APP_DIR, "profile.log")
+PROFILE_LOG_BYTES = 1024 * 1024
+PROFILE_MAX_SPANS = 1000
+PROFILING = False
+LAST_INTERACTION = {"name": None, "spans": []}
+
+profile_log = logging.getLogger("SeriesChecker.profile")
+profile_log.propagate = False
+
+class _NoSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_exc):
+        return False
+
+NO_SPAN = _NoSpan()
+
+class Span:
+    __slots__ = ("name", "detail", "start")
+
+    def __init__(self, name, detail):
+        self.name = name
+        self.detail = detail
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *_exc):
+        ms = (time.perf_counter() - self.start) * 1000
+        interaction = LAST_INTERACTION
+        if len(interaction["spans"]) < PROFILE_MAX_SPANS:
+            interaction["spans"].append((self.name, self.detail, ms))
+        profile_log.info("%s\t%s\t%.3f\t%s", interaction["name"] or "-", self.name, ms, self.detail or "")
+        return False
+
+def span(name, detail=None):
+    """Context manager timing a block; a shared no-op while profiling is off"""
+    if not PROFILING:
+        return NO_SPAN
+    return Span(name, detail)
+
+def timed(name):
+    """Decorator wrapping every call of a function in span(name)"""
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not PROFILING:
+                return func(*args, **kwargs)
+            with Span(name, None):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+def set_profiling(enabled):
+    """Switch spans on or off; spans go to a rotating profile.log next to the data directory"""
+    global PROFILING
+    if enabled and not profile_log.handlers:
+        handler = RotatingFileHandler(PROFILE_LOG_PATH, maxBytes=PROFILE_LOG_BYTES, backupCount=3, encoding="utf-8")
+        handler.setFormatter(logging.Formatter("%(asctime)s\t%(threadName)s\t%(message)s"))
+        profile_log.addHandler(handler)
+        profile_log.setLevel(logging.INFO)
+    PROFILING = enabled
+
+def profiling_enabled():
+    return PROFILING
+
+def begin_interaction(name):
+    """Start collecting spans for a new user interaction, e.g. a button click"""
+    global LAST_INTERACTION
+    if PROFILING:
+        LAST_INTERACTION = {"name": name, "spans": []}
+
+def last_interaction():
+    """(name, [(span, detail, ms), ...]) of the most recent interaction"""
+    interaction = LAST_INTERACTION
+    return interaction["name"], list(interaction["spans"])
+
+set_profiling(bool(os.environ.get("SERIESCHECKER_PROFILE")))
+
+# 🔹 Connection pool: one read-only and one write connection per database file, kept open until closed
+DB_READ_PRAGMAS = ("PRAGMA query_only = 1", "PRAGMA mmap_size = 67108864", "PRAGMA cache_size = -8192")
+DB_WRITE_PRAGMAS = ("PRAGMA journal_mode = WAL", "PRAGMA synchronous = NORMAL")
+DB_CACHED_STATEMENTS = 256
+
+class Database:
+    """Pooled connections to one SQLite file, with per-statement timings for diagnostics.
+
+    Connections are shared between threads and serialized by a lock. Call close() before the file is
+    replaced, renamed or copied; the next query reopens it.
+    """
+
+    def __init__(self, path, wal=True):
+        self.path = path
+        self.wal = wal
+        self.lock = threading.RLock()
+        self.reader = None
+        self.writer = None
+        self.opened = 0
+        self.timings = {}       # SQL -> [calls, total seconds]
+
+    def read_connection(self):
+        with self.lock:
+            if self.reader is None:
+                with span("db.open", self.path):
+                    uri = Path(self.path).resolve().as_uri() + "?mode=ro"
+                    self.reader = sqlite3.connect(uri, uri=True, check_same_thread=False,
+                                                  cached_statements=DB_CACHED_STATEMENTS)
+                    for pragma in DB_READ_PRAGMAS:
+                        self.reader.execute(pragma)
+                self.opened += 1
+            return self.reader
+
+    def write_connection(self):
+        """Autocommit connection; group statements with transaction()"""
+        with self.lock:
+            if self.writer is None:
+                with span("db.open", self.path):
+                    self.writer = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False,
+                                                  cached_statements=DB_CACHED_STATEMENTS)
+                    if self.wal:
+                        for pragma in DB_WRITE_PRAGMAS:
+                            self.writer.execute(pragma)
+                self.opened += 1
+            return self.writer
+
+    def _record(self, sql, start):
+        entry = self.timings.setdefault(sql, [0, 0.0])
+        entry[0] += 1
+        entry[1] += time.perf_counter() - start
+
+    def query(self, sql, params=()):
+        """All rows of a read-only query"""
+        with self.lock, span("db.query", sql):
+            start = time.perf_counter()
+            rows = self.read_connection().execute(sql, params).fetchall()
+            self._record(sql, start)
+        return rows
+
+    def query_value(self, sql, params=(), default=None):
+        """First column of the first row, or default"""
+        rows = self.query(sql, params)
+        return rows[0][0] if rows else default
+
+    def execute(self, sql, params=()):
+        with self.transaction() as conn, span("db.execute", sql):
+            start = time.perf_counter()
+            conn.execute(sql, params)
+            self._record(sql, start)
+
+    def execute_many(self, sql, rows):
+        with self.transaction() as conn, span("db.execute", sql):
+            start = time.perf_counter()
+            conn.executemany(sql, rows)
+            self._record(sql, start)
+
+    @contextmanager
+    def transaction(self):
+        """Write connection inside BEGIN IMMEDIATE ... COMMIT, rolled back on error"""
+        with self.lock:
+            conn = self.write_connection()
+            if conn.in_transaction:
+                yield conn
+                return
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    def close(self):
+        with self.lock:
+            for conn in (self.reader, self.writer):
+                if conn is not None:
+                    conn.close()
+            self.reader = self.writer = None
+
+    def stats(self):
+        with self.lock:
+            return {"path": self.path, "open": (self.reader is not None) + (self.writer is not None),
+                    "opened": self.opened,
+                    "queries": {sql: {"calls": calls, "seconds": round(total, 6)}
+                                for sql, (calls, total) in self.timings.items()}}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_exc):
+        self.close()
+
+CARS = Database(CARS_DB)
+TRACKS = Database(TRACKS_DB)
+SCHEDULE = Database(SCHEDULE_DB)
+DATABASES = (CARS, TRACKS, SCHEDULE)
+CATALOGS = {"cars": CARS, "tracks": TRACKS}
+
+def close_databases():
+    """Close the pooled connections to the data directory, e.g. before it is copied or swapped"""
+    for db in DATABASES:
+        db.close()
+
+def database_stats():
+    """Connection counts and per-statement timings of the pooled databases"""
+    return [db.stats() for db in DATABASES]
+
+# 🔹 Database worker: one thread runs all database and data directory work in submission order
+class DatabaseJob:
+    def __init__(self, func, args, on_done, on_error):
+        self.func = func
+        self.args = args
+        self.on_done = on_done
+        self.on_error = on_error
+        self.result = None
+        self.error = None
+        self.cancelled = False
+        self.waited = False    # call() re-raises the error to its caller
+        self.done = threading.Event()
+
+    def cancel(self):
+        self.cancelled = True
+
+class DatabaseWorker:
+    """Runs jobs on a dedicated thread and hands results to dispatch (e.g. root.after) for delivery.
+
+    Submitting a job with a key cancels the previous job with the same key: it is skipped if it has
+    not started yet, and its callbacks are dropped if it has.
+    """
+
+    def __init__(self, dispatch=None):
+        self.dispatch = dispatch or (lambda callback: callback())
+        self.jobs = queue.Queue()
+        self.latest = {}
+        self.thread = threading.Thread(target=self._run, name="database-worker", daemon=True)
+        self.thread.start()
+
+    def cancel(self, key):
+        previous = self.latest.pop(key, None)
+        if previous is not None:
+            previous.cancel()
+
+    def submit(self, func, *args, on_done=None, on_error=None, key=None):
+        job = DatabaseJob(func, args, on_done, on_error)
+        if key is not None:
+            self.cancel(key)
+            self.latest[key] = job
+        self.jobs.put(job)
+        return job
+
+    def call(self, func, *args):
+        """Run func on the worker and wait for its result; runs inline when already on the worker"""
+        if threading.current_thread() is self.thread:
+            return func(*args)
+        job = DatabaseJob(func, args, None, None)
+        job.waited = True
+        self.jobs.put(job)
+        job.done.wait()
+        if job.error is not None:
+            raise job.error
+        return job.result
+
+    def _run(self):
+        while True:
+            job = self.jobs.get()
+            if not job.cancelled:
+                try:
+                    job.result = job.func(*job.args)
+                except Exception as e:
+                    job.error = e
+            job.done.set()
+            if job.cancelled:
+                continue
+            if job.error is not None:
+                if job.on_error is not None:
+                    self.dispatch(lambda job=job: job.cancelled or job.on_error(job.error))
+                elif not job.waited:
+                    log.error("Database job %s failed: %s", getattr(job.func, "__name__", job.func), job.error)
+            elif job.on_done is not None:
+                self.dispatch(lambda job=job: job.cancelled or job.on_done(job.result))
+
+DB_WORKER = None
+
+def start_db_worker(dispatch=None):
+    global DB_WORKER
+    DB_WORKER = DatabaseWorker(dispatch)
+    return DB_WORKER
+
+def run_db(func, *args):
+    """Run func on the database worker if one is running (the GUI), else inline (the CLI)"""
+    if DB_WORKER is None:
+        return func(*args)
+    return DB_WORKER.call(func, *args)
+
+# 🔹 Update HTTP: one pooled session, conditional version checks and backoff while offline
+HTTP = requests.Session()
+# Seconds after a successful check during which launches skip the network
+UPDATE_CHECK_INTERVAL = float(os.environ.get("SERIESCHECKER_CHECK_INTERVAL", 3600))
+UPDATE_BACKOFF_BASE = 30
+UPDATE_BACKOFF_MAX = 3600
+
+def read_update_state():
+    try:
+        with open(UPDATE_STATE_FILE, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def write_update_state(state):
+    tmp_path = UPDATE_STATE_FILE + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(state, f)
+    os.replace(tmp_path, UPDATE_STATE_FILE)
+
+def fetch_online_version(local_version=None):
+    """Published data version, or None if local_version was confirmed within UPDATE_CHECK_INTERVAL.
+
+    Sends the stored ETag/Last-Modified so an unchanged version.txt costs a 304. After a failed check,
+    further checks are refused with exponential backoff until the retry time has passed, unless there
+    is no local version yet: a first install always tries.
+    """
+    state = read_update_state()
+    now = time.time()
+    if local_version and now < state.get("retry_at", 0):
+        raise ConnectionError(f"offline, next check in {int(state['retry_at'] - now)} s")
+    if local_version and state.get("version") == local_version and now - state.get("checked_at", 0) < UPDATE_CHECK_INTERVAL:
+        return None
+
+    headers = {}
+    if state.get("version"):
+        if state.get("etag"):
+            headers["If-None-Match"] = state["etag"]
+        if state.get("last_modified"):
+            headers["If-Modified-Since"] = state["last_modified"]
+    try:
+        r = HTTP.get(f"{UPDATE_BASE_URL}/version.txt", headers=headers, timeout=5)
+        if r.status_code != 304:
+            r.raise_for_status()
+    except requests.RequestException:
+        failures = state.get("failures", 0) + 1
+        state.update(failures=failures,
+                     retry_at=now + min(UPDATE_BACKOFF_BASE * 2 ** (failures - 1), UPDATE_BACKOFF_MAX))
+        write_update_state(state)
+        raise
+
+    if r.status_code == 304:
+        version = state["version"]
+    else:
+        version = r.text.strip()
+        state.update(etag=r.headers.get("ETag"), last_modified=r.headers.get("Last-Modified"))
+    state.update(version=version, checked_at=now, failures=0, retry_at=0)
+    write_update_state(state)
+    return version
+
+DOWNLOAD_PART_PATH = "data.zip.part"
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+DOWNLOAD_RETRIES = 5
+
+def fetch_published_checksum(url):
+    """Return the published SHA-256 for url, or None if the server does not provide one"""
+    try:
+        r = HTTP.get(f"{url}.sha256", timeout=10)
+        if r.status_code != 200:
+            return None
+        return r.text.split()[0].lower() if r.text.strip() else None
+    except requests.RequestException:
+        return None
+
+@timed("update.download")
+def download_data_package(data_url, report=print):
+    """Stream data_url into DOWNLOAD_PART_PATH, resuming after interruptions, and verify it.
+
+    A resume sends If-Range with the ETag (or Last-Modified) the part file was started with, so a
+    package republished in between is downloaded from the start instead of being appended to.
+    """
+    expected_sha256 = fetch_published_checksum(data_url)
+
+    for attempt in range(1, DOWNLOAD_RETRIES + 1):
+        offset = os.path.getsize(DOWNLOAD_PART_PATH) if os.path.exists(DOWNLOAD_PART_PATH) else 0
+        validator = read_update_state().get("download_validator")
+        headers = {"Range": f"bytes={offset}-", "If-Range": validator} if offset and validator else {}
+        try:
+            with HTTP.get(data_url, headers=headers, stream=True, timeout=(10, 60)) as r:
+                if r.status_code == 416:
+                    # Nothing left to fetch if the part file already has the full size
+                    size = r.headers.get("Content-Range", "").rpartition("/")[2]
+                    if size.isdigit() and int(size) == offset:
+                        break
+                    os.remove(DOWNLOAD_PART_PATH)
+                    continue
+                r.raise_for_status()
+                if r.status_code != 206:
+                    offset = 0
+                    state = read_update_state()
+                    state["download_validator"] = r.headers.get("ETag") or r.headers.get("Last-Modified")
+                    write_update_state(state)
+                total = int(r.headers.get("Content-Length", 0)) + offset
+
+                done = offset
+                last_report = 0
+                with open(DOWNLOAD_PART_PATH, "ab" if offset else "wb") as f:
+                    for chunk in r.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                        f.write(chunk)
+                        done += len(chunk)
+                        if time.time() - last_report > 0.2:
+                            last_report = time.time()
+                            text = f"⬇️ Downloading data... {done / 1e6:.1f} MB"
+                            if total:
+                                text += f" / {total / 1e6:.1f} MB ({done * 100 // total}%)"
+                            report(text)
+            break
+        except requests.RequestException:
+            if attempt == DOWNLOAD_RETRIES:
+                raise
+            report(f"🔁 Connection lost, resuming download ({attempt}/{DOWNLOAD_RETRIES - 1})...")
+            time.sleep(min(2 ** attempt, 30))
+
+    if not zipfile.is_zipfile(DOWNLOAD_PART_PATH):
+        if os.path.exists(DOWNLOAD_PART_PATH):
+            os.remove(DOWNLOAD_PART_PATH)
+        raise ValueError("data.zip download is incomplete or corrupt")
+    if expected_sha256:
+        sha256 = hashlib.sha256()
+        with open(DOWNLOAD_PART_PATH, "rb") as f:
+            for chunk in iter(lambda: f.read(DOWNLOAD_CHUNK_SIZE), b""):
+                sha256.update(chunk)
+        if sha256.hexdigest() != expected_sha256:
+            os.remove(DOWNLOAD_PART_PATH)
+            raise ValueError("data.zip checksum mismatch")
+    return DOWNLOAD_PART_PATH
+
+DATA_DIR = "data"
+STAGING_DIR = "data.staging"
+PREVIOUS_DIR = "data.previous"
+
+DATA_SCHEMA = {
+    "cars.db": ("cars", {"id", "name", "price", "licensed"}),
+    "tracks.db": ("tracks", {"id", "name", "price", "licensed"}),
+}
+SCHEDULE_COLUMNS = {"cars", "license", "week", "track", "class"}
+
+def validate_data_dir(path):
+    """Raise ValueError unless every database in path opens and has the expected schema"""
+    for db_name, (table, columns) in DATA_SCHEMA.items():
+        db_path = os.path.join(path, db_name)
+        if not os.path.exists(db_path):
+            raise ValueError(f"{db_name} is missing")
+        with Database(db_path) as db:
+            if db.query_value("PRAGMA quick_check") != "ok":
+                raise ValueError(f"{db_name} is corrupt")
+            found = {row[1] for row in db.query(f"PRAGMA table_info({table})")}
+            if not columns <= found:
+                raise ValueError(f"{db_name} is missing columns {sorted(columns - found)}")
+
+    db_path = os.path.join(path, "schedule.db")
+    if not os.path.exists(db_path):
+        raise ValueError("schedule.db is missing")
+    with Database(db_path) as db:
+        tables = [row[0] for row in db.query("SELECT name FROM sqlite_master WHERE type='table'")]
+        if not tables:
+            raise ValueError("schedule.db has no series")
+        for table in tables:
+            found = {row[1] for row in db.query(f"PRAGMA table_info('{table}')")}
+            if not SCHEDULE_COLUMNS <= found:
+                raise ValueError(f"schedule.db series {table} is missing columns {sorted(SCHEDULE_COLUMNS - found)}")
+
+def recover_data_dir():
+    """Roll back to the previous data version if a swap was interrupted"""
+    if not os.path.exists(DATA_DIR) and os.path.exists(PREVIOUS_DIR):
+        os.rename(PREVIOUS_DIR, DATA_DIR)
+    if os.path.exists(STAGING_DIR):
+        shutil.rmtree(STAGING_DIR, ignore_errors=True)
+
+def swap_in_staging_dir():
+    """Replace DATA_DIR with STAGING_DIR, keeping the old data in PREVIOUS_DIR for rollback"""
+    if os.path.exists(PREVIOUS_DIR):
+        shutil.rmtree(PREVIOUS_DIR)
+    if os.path.exists(DATA_DIR):
+        os.rename(DATA_DIR, PREVIOUS_DIR)
+    try:
+        os.rename(STAGING_DIR, DATA_DIR)
+    except OSError:
+        if os.path.exists(PREVIOUS_DIR) and not os.path.exists(DATA_DIR):
+            os.rename(PREVIOUS_DIR, DATA_DIR)
+        raise
+
+@timed("update.extract")
+def stage_data_package(package_path, version):
+    """Extract and validate a data package into STAGING_DIR; a package that fails either is deleted"""
+    if os.path.exists(STAGING_DIR):
+        shutil.rmtree(STAGING_DIR)
+    try:
+        with zipfile.ZipFile(package_path) as z:
+            z.extractall(STAGING_DIR)
+        validate_data_dir(STAGING_DIR)
+    except Exception:
+        shutil.rmtree(STAGING_DIR, ignore_errors=True)
+        # Otherwise the next download would resume onto it and fail the same way
+        os.remove(package_path)
+        raise
+    with open(os.path.join(STAGING_DIR, "local_version.txt"), "w", encoding="utf-8") as f:
+        f.write(version)
+
+# Columns that hold user state and are never part of a published delta
+USER_COLUMNS = {"licensed"}
+
+def table_digest(conn, table):
+    """SHA-256 over the published columns and rows of a table, in rowid order"""
+    columns = [row[1] for row in conn.execute(f"PRAGMA table_info('{table}')") if row[1] not in USER_COLUMNS]
+    sha256 = hashlib.sha256(json.dumps(columns, ensure_ascii=False).encode("utf-8"))
+    column_list = ", ".join(f'"{c}"' for c in columns)
+    for row in conn.execute(f'SELECT {column_list} FROM "{table}" ORDER BY rowid'):
+        sha256.update(b"\n")
+        sha256.update(json.dumps(row, ensure_ascii=False).encode("utf-8"))
+    return sha256.hexdigest()
+
+def file_digest(path):
+    sha256 = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(DOWNLOAD_CHUNK_SIZE), b""):
+            sha256.update(chunk)
+    return sha256.hexdigest()
+
+def fetch_delta(digest):
+    r = HTTP.get(f"{UPDATE_BASE_URL}/delta/{digest}", timeout=(10, 60))
+    r.raise_for_status()
+    return r
+
+def apply_table_delta(conn, table, payload):
+    """Replace a table's published rows with payload inside the caller's transaction"""
+    columns = payload["columns"]
+    column_list = ", ".join(f'"{c}"' for c in columns)
+    placeholders = ", ".join("?" for _ in columns)
+    exists = conn.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name = ?", (table,)).fetchone()
+
+    if exists and "licensed" in {row[1] for row in conn.execute(f"PRAGMA table_info('{table}')")}:
+        # Catalog tables keep their schema and start from the shipped default like a data.zip install:
+        # free content licensed, the rest not. Owned licenses are carried over afterwards
+        conn.execute(f'DELETE FROM "{table}"')
+        conn.executemany(f'INSERT INTO "{table}" ({column_list}) VALUES ({placeholders})', payload["rows"])
+        conn.execute(f'UPDATE "{table}" SET licensed = CASE WHEN {FREE_CONTENT_SQL} THEN 1 ELSE 0 END')
+    else:
+        column_defs = ", ".join(f'"{c}" {t}' for c, t in zip(columns, payload["types"]))
+        conn.execute(f'DROP TABLE IF EXISTS "{table}"')
+        conn.execute(f'CREATE TABLE "{table}" ({column_defs})')
+        conn.executemany(f'INSERT INTO "{table}" ({column_list}) VALUES ({placeholders})', payload["rows"])
+
+@timed("update.delta")
+def apply_delta_update(version, report=print):
+    """Stage an update from the published manifest, fetching only changed tables and files.
+
+    Returns False if no usable manifest is published, so the caller can fall back to data.zip.
+    """
+    r = HTTP.get(f"{UPDATE_BASE_URL}/manifest.json", timeout=10)
+    if r.status_code != 200:
+        return False
+    manifest = r.json()
+    if manifest.get("version") != version or not os.path.exists(DATA_DIR):
+        return False
+
+    if os.path.exists(STAGING_DIR):
+        shutil.rmtree(STAGING_DIR)
+    # Copy on the database worker so no ownership write lands halfway through the copy; closing the
+    # pool checkpoints the WAL into the database files first
+    def copy_data_dir():
+        close_databases()
+        shutil.copytree(DATA_DIR, STAGING_DIR,
+                        ignore=shutil.ignore_patterns("schedule.snap*", "schedule_index.db*", "local_version.txt", "cache"))
+    run_db(copy_data_dir)
+    try:
+        fetched = 0
+        for name, digest in manifest["files"].items():
+            path = os.path.join(STAGING_DIR, name)
+            if os.path.exists(path) and file_digest(path) == digest:
+                continue
+            content = fetch_delta(digest).content
+            if hashlib.sha256(content).hexdigest() != digest:
+                raise ValueError(f"Delta for {name} failed verification")
+            with open(path, "wb") as f:
+                f.write(content)
+            fetched += len(content)
+
+        for db_name, tables in manifest["tables"].items():
+            with Database(os.path.join(STAGING_DIR, db_name), wal=False) as db, db.transaction() as conn:
+                local_tables = [row[0] for row in conn.execute(
+                    "SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%'")]
+                for table in local_tables:
+                    if table not in tables:
+                        conn.execute(f'DROP TABLE "{table}"')
+                for table, digest in tables.items():
+                    if table in local_tables and table_digest(conn, table) == digest:
+                        continue
+                    delta = fetch_delta(f"{digest}.json")
+                    fetched += len(delta.content)
+                    apply_table_delta(conn, table, delta.json())
+                    if table_digest(conn, table) != digest:
+                        raise ValueError(f"Delta for {db_name}/{table} failed verification")
+
+        validate_data_dir(STAGING_DIR)
+    except Exception:
+        shutil.rmtree(STAGING_DIR, ignore_errors=True)
+        raise
+
+    with open(os.path.join(STAGING_DIR, "local_version.txt"), "w", encoding="utf-8") as f:
+        f.write(version)
+    report(f"⬇️ Delta update fetched {fetched / 1e3:.0f} KB")
+    return True
+
+def carry_over_licenses(old_dir, new_dir):
+    """Copy licensed flags by name from old_dir into new_dir.
+
+    Every name that exists in both gets its old flag exactly, so content the user un-owned stays
+    un-owned even where new_dir started as a copy of older data; new names keep the shipped default.
+    Returns the owned names per catalog table that no longer exist in the new data.
+    """
+    missing = {}
+    for db_name, (table, _columns) in DATA_SCHEMA.items():
+        old_path = os.path.join(old_dir, db_name)
+        if not os.path.exists(old_path):
+            continue
+        with Database(os.path.join(new_dir, db_name), wal=False) as db:
+            conn = db.write_connection()
+            conn.execute("ATTACH DATABASE ? AS old", (old_path,))
+            with db.transaction():
+                conn.execute(f"UPDATE main.{table} SET licensed = COALESCE("
+                             f"(SELECT o.licensed FROM old.{table} o WHERE o.name = main.{table}.name), licensed)")
+            missing[table] = [row[0] for row in conn.execute(
+                f"SELECT name FROM old.{table} WHERE licensed = 1 AND name NOT IN (SELECT name FROM main.{table}) ORDER BY name")]
+            conn.execute("DETACH DATABASE old")
+    return missing
+
+@timed("update.install")
+def install_staged_data(version, package_path=None, carry_over=True):
+    """Swap in STAGING_DIR with licenses carried over, rebuild the snapshot and reload the model.
+
+    Returns the owned names per catalog table that no longer exist in the new data.
+    """
+    close_databases()
+    missing = carry_over_licenses(DATA_DIR, STAGING_DIR) if carry_over else {}
+    swap_in_staging_dir()
+    if package_path:
+        os.remove(package_path)
+    build_schedule_snapshot(version)
+    load_schedule_model()
+    get_planner_cache().forget(keep_version=version)
+    return missing
+
+def check_for_updates(report=print):
+    """Check for and install new data; downloads run on the calling thread, file swaps on the database worker.
+
+    Returns the owned car and track names that an installed update no longer lists.
+    """
+    dropped = []
+    try:
+        run_db(recover_data_dir)
+        data_url = f"{UPDATE_BASE_URL}/data.zip"
+        local_version_path = os.path.join("data", "local_version.txt")
+
+        # 🔹 Determine local version
+        LOCAL_VERSION = None
+        if os.path.exists(local_version_path):
+            try:
+                with open(local_version_path, "r", encoding="utf-8") as f:
+                    LOCAL_VERSION = f.read().strip()
+            except Exception:
+                LOCAL_VERSION = None
+
+        # 🔹 Load initial data if no local version exists
+        if not LOCAL_VERSION:
+            report("⬇️ Loading initial data...")
+            online_version = fetch_online_version()
+            package_path = download_data_package(data_url, report)
+            stage_data_package(package_path, online_version)
+            run_db(install_staged_data, online_version, package_path, False)
+            report(f"✅ Initial data loaded (v{online_version})")
+            return
+
+        # 🔹 Check online version, unless it was confirmed recently
+        online_version = fetch_online_version(LOCAL_VERSION)
+        if online_version and online_version != LOCAL_VERSION:
+            report(f"🆕 New version {online_version} – updating...")
+
+            # Only fetch changed tables and files if a manifest is published
+            try:
+                delta_applied = apply_delta_update(online_version, report)
+            except Exception:
+                delta_applied = False
+
+            package_path = None
+            if not delta_applied:
+                # Download and extract new data package
+                package_path = download_data_package(data_url, report)
+                stage_data_package(package_path, online_version)
+
+            # Restore license state into the staged databases in one statement per catalog
+            missing = run_db(install_staged_data, online_version, package_path)
+            dropped = missing.get("cars", []) + missing.get("tracks", [])
+            if dropped:
+                text = (f"✅ Update completed (v{online_version}) – {len(dropped)} owned item(s) no longer listed: "
+                        + ", ".join(dropped[:5]) + (" ..." if len(dropped) > 5 else ""))
+            else:
+                text = f"✅ Update completed (v{online_version})"
+            report(text)
+        else:
+            report("✅ Data is up to date.")
+    except Exception as e:
+        report(f"⚠️ Update failed: {e}")
+    finally:
+        # 🔹 Load the schedule model once the data on disk is final
+        try:
+            run_db(get_schedule_model)
+        except Exception:
+            pass
+    return dropped
+
+def read_local_version():
+    try:
+        with open(LOCAL_VERSION_FILE, "r", encoding="utf-8") as f:
+            return f.read().strip()
+    except Exception:
+        return ""
+
+def normalize_name(name):
+    return " ".join(name.split()).casefold()
+
+def canonical_car_id(car_ids, name):
+    """Catalog ID for a car name from the schedule, or None.
+
+    Schedules name variants of one catalog car as "<car> - <variant>" (e.g. "Dirt Sprint Car - 410"),
+    so a name without an exact match falls back to the part before the first " - ".
+    """
+    key = normalize_name(name)
+    if key in car_ids:
+        return car_ids[key]
+    return car_ids.get(key.split(" - ")[0])
+
+# 🔹 Schedule snapshot: schedule.db and the catalogs compiled into typed columns in one file, which is
+# memory-mapped to load the model. Strings are stored once and referenced by their position in the
+# string table; SQLite is only read for the licensed flags and written for ownership changes.
+SNAPSHOT_MAGIC = b"SCSNAP\0\0"
+# Bump when the layout or the car name resolution changes so existing snapshots are rebuilt
+SNAPSHOT_FORMAT = 1
+SNAPSHOT_ALIGN = 8
+NO_ID = -1                  # car or track that is not in the catalog
+SEARCH_KINDS = ("series", "cars", "tracks")
+
+SNAPSHOT_COLUMNS = {
+    # Per series; the *_start columns have one extra entry, series i owns rows start[i] to start[i + 1]
+    "series_name": "I", "series_class": "I", "series_license": "I", "series_week_start": "I", "series_car_start": "I",
+    # Per race week and per car listed for a series, grouped by series
+    "week": "H", "week_track_id": "i", "week_track": "I",
+    "car_id": "i", "car": "I",
+    # Catalogs
+    "cars_id": "i", "cars_name": "I", "cars_price": "I",
+    "tracks_id": "i", "tracks_name": "I", "tracks_price": "I",
+    # Search indexes, see SearchIndex
+    **{f"search_{kind}_{column}": typecode for kind in SEARCH_KINDS
+       for column, typecode in (("name", "I"), ("folded", "I"), ("gram", "I"), ("gram_start", "I"), ("posting", "I"))},
+    # NUL-separated UTF-8 string table
+    "strings": "B",
+}
+
+@timed("snapshot.build")
+def build_schedule_snapshot(version):
+    """Compile the per-series tables of schedule.db and the catalogs into SCHEDULE_SNAPSHOT"""
+    strings = {"": 0}
+    def string_id(text):
+        return strings.setdefault(text or "", len(strings))
+
+    columns = {name: array.array(typecode) for name, typecode in SNAPSHOT_COLUMNS.items()}
+    catalog_names = {}
+    for table in ("cars", "tracks"):
+        rows = CATALOGS[table].query(f"SELECT id, name, price FROM {table} ORDER BY id")
+        catalog_names[table] = {item_id: name for item_id, name, _price in rows}
+        columns[f"{table}_id"].extend(row[0] for row in rows)
+        columns[f"{table}_name"].extend(string_id(row[1]) for row in rows)
+        columns[f"{table}_price"].extend(string_id(row[2]) for row in rows)
+    car_ids = {normalize_name(name): car_id for car_id, name in catalog_names["cars"].items()}
+    track_ids = {name: track_id for track_id, name in catalog_names["tracks"].items()}
+
+    tables = [row[0] for row in SCHEDULE.query("SELECT name FROM sqlite_master WHERE type='table' ORDER BY rowid")]
+    schedule_cars, schedule_tracks = set(), set()
+    columns["series_week_start"].append(0)
+    columns["series_car_start"].append(0)
+    for table in tables:
+        rows = SCHEDULE.query(f"SELECT cars, license, week, track, class FROM \"{table}\" ORDER BY rowid")
+        columns["series_name"].append(string_id(table))
+        columns["series_class"].append(string_id(next((row[4] for row in rows if row[4]), None)))
+        columns["series_license"].append(string_id(next((row[1] for row in rows if row[1]), None)))
+
+        # Cars are listed for the whole series, one or more per row, independent of the week column
+        cars = dict.fromkeys(car.strip() for row in rows if row[0] for car in row[0].splitlines() if car.strip())
+        for car in cars:
+            car_id = canonical_car_id(car_ids, car)
+            columns["car_id"].append(NO_ID if car_id is None else car_id)
+            columns["car"].append(string_id(car))
+        schedule_cars.update(cars)
+
+        weeks = {}
+        for week_index, row in enumerate(rows, start=1):
+            if row[3]:
+                weeks.setdefault(row[2] or week_index, row[3])
+        for week in sorted(weeks):
+            columns["week"].append(week)
+            columns["week_track_id"].append(track_ids.get(weeks[week], NO_ID))
+            columns["week_track"].append(string_id(weeks[week]))
+        schedule_tracks.update(weeks.values())
+        columns["series_week_start"].append(len(columns["week"]))
+        columns["series_car_start"].append(len(columns["car"]))
+
+    # Catalog entries without a race this season stay searchable in the content menu
+    indexes = {"series": SearchIndex(tables), "cars": SearchIndex(schedule_cars | set(catalog_names["cars"].values())),
+               "tracks": SearchIndex(schedule_tracks | set(catalog_names["tracks"].values()))}
+    for kind, index in indexes.items():
+        columns[f"search_{kind}_name"].extend(string_id(name) for name in index.names)
+        columns[f"search_{kind}_folded"].extend(string_id(name) for name in index.folded)
+        columns[f"search_{kind}_gram"].extend(string_id(gram) for gram in index.grams)
+        columns[f"search_{kind}_gram_start"] = index.gram_start
+        columns[f"search_{kind}_posting"] = index.postings
+    columns["strings"].frombytes("\0".join(strings).encode("utf-8"))
+
+    layout, offset = {}, 0
+    for name, column in columns.items():
+        layout[name] = [column.typecode, offset, len(column)]
+        offset += -(-len(column) * column.itemsize // SNAPSHOT_ALIGN) * SNAPSHOT_ALIGN
+    header = json.dumps({"format": SNAPSHOT_FORMAT, "version": version, "byteorder": sys.byteorder,
+                         "columns": layout}).encode("utf-8")
+
+    tmp_path = SCHEDULE_SNAPSHOT + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(SNAPSHOT_MAGIC + struct.pack("<I", len(header)) + header)
+        f.write(bytes(-f.tell() % SNAPSHOT_ALIGN))
+        for column in columns.values():
+            column.tofile(f)
+            f.write(bytes(-len(column) * column.itemsize % SNAPSHOT_ALIGN))
+    os.replace(tmp_path, SCHEDULE_SNAPSHOT)
+
+class ScheduleSnapshot:
+    """A snapshot file mapped read-only; columns are memoryviews into the mapping until close()"""
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            if self.map[:len(SNAPSHOT_MAGIC)] != SNAPSHOT_MAGIC:
+                raise ValueError(f"{path} is not a schedule snapshot")
+            (header_size,) = struct.unpack_from("<I", self.map, len(SNAPSHOT_MAGIC))
+            header_start = len(SNAPSHOT_MAGIC) + 4
+            header = json.loads(self.map[header_start:header_start + header_size])
+            if header["byteorder"] != sys.byteorder:
+                raise ValueError(f"{path} was written on a {header['byteorder']}-endian machine")
+            data_start = -(-(header_start + header_size) // SNAPSHOT_ALIGN) * SNAPSHOT_ALIGN
+            spans = {name: (typecode, data_start + offset, data_start + offset + count * array.array(typecode).itemsize)
+                     for name, (typecode, offset, count) in header["columns"].items()}
+            if any(end > len(self.map) for _typecode, _begin, end in spans.values()):
+                raise ValueError(f"{path} is truncated")
+        except Exception:
+            self.map.close()
+            raise
+        self.format = header["format"]
+        self.version = header["version"]
+        self.view = memoryview(self.map)
+        self.columns = {name: self.view[begin:end].cast(typecode) for name, (typecode, begin, end) in spans.items()}
+        self.strings = str(self.columns["strings"], "utf-8").split("\0")
+
+    def text(self, column):
+        """The strings a column of string IDs refers to"""
+        strings = self.strings
+        return [strings[i] for i in self.columns[column]]
+
+    def close(self):
+        for column in self.columns.values():
+            column.release()
+        self.view.release()
+        self.map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_exc):
+        self.close()
+
+def open_schedule_snapshot():
+    """Map SCHEDULE_SNAPSHOT, rebuilding it first if it is missing, unreadable or from other data"""
+    version = read_local_version()
+    try:
+        snapshot = ScheduleSnapshot(SCHEDULE_SNAPSHOT)
+    except (OSError, ValueError, KeyError, TypeError, struct.error):
+        snapshot = None
+    if snapshot is not None:
+        if snapshot.version == version and snapshot.format == SNAPSHOT_FORMAT:
+            return snapshot
+        snapshot.close()
+    build_schedule_snapshot(version)
+    return ScheduleSnapshot(SCHEDULE_SNAPSHOT)
+
+def parse_price(text):
+    """Return a catalog price like '$11.95' or 'Free' in dollars, or None if it is not for sale"""
+    if text is None or not text.strip() or text.strip().lower() == "free":
+        return 0.0
+    try:
+        return float(text.strip().lstrip("$").replace(",", ""))
+    except ValueError:
+        return None
+
+# 🔹 Coverage matrix cell states, see ScheduleModel.coverage
+COVERAGE_WEEKS = 12
+COVERAGE_NO_RACE, COVERAGE_OWNED, COVERAGE_NO_TRACK, COVERAGE_NO_CAR, COVERAGE_NO_CAR_TRACK = range(5)
+
+SEARCH_MIN_SCORE = 0.6
+SEARCH_LIMIT = 50
+
+def fold_name(name):
+    """Lowercase, accent-free, single-spaced form of a name; underscores in table names count as spaces"""
+    name = unicodedata.normalize("NFKD", name.replace("_", " "))
+    return " ".join("".join(c for c in name if not unicodedata.combining(c)).split()).casefold()
+
+class SearchIndex:
+    """Trigram index over names for case-insensitive substring and typo-tolerant lookup.
+
+    The postings are flat arrays, trigram grams[i] -> postings[gram_start[i]:gram_start[i + 1]], so
+    an index is stored in the schedule snapshot as is.
+    """
+
+    def __init__(self, names):
+        self.names = sorted(names)
+        self.folded = [fold_name(name) for name in self.names]
+        trigrams = {}
+        for i, name in enumerate(self.folded):
+            padded = f" {name} "
+            for j in range(len(padded) - 2):
+                trigrams.setdefault(padded[j:j + 3], set()).add(i)
+        self.grams = sorted(trigrams)
+        self.gram_start = array.array("I", [0])
+        self.postings = array.array("I")
+        for gram in self.grams:
+            self.postings.extend(sorted(trigrams[gram]))
+            self.gram_start.append(len(self.postings))
+
+    @classmethod
+    def from_snapshot(cls, snapshot, kind):
+        index = cls.__new__(cls)
+        index.names = snapshot.text(f"search_{kind}_name")
+        index.folded = snapshot.text(f"search_{kind}_folded")
+        index.grams = snapshot.text(f"search_{kind}_gram")
+        index.gram_start = array.array("I", snapshot.columns[f"search_{kind}_gram_start"])
+        index.postings = array.array("I", snapshot.columns[f"search_{kind}_posting"])
+        return index
+
+    def lookup(self, gram):
+        """Positions of the names containing a trigram"""
+        i = bisect.bisect_left(self.grams, gram)
+        if i == len(self.grams) or self.grams[i] != gram:
+            return ()
+        return self.postings[self.gram_start[i]:self.gram_start[i + 1]]
+
+    def search(self, text):
+        """Names containing text"""
+        text = fold_name(text)
+        if len(text) < 3:
+            candidates = range(len(self.names))
+        else:
+            grams = [set(self.lookup(text[j:j + 3])) for j in range(len(text) - 2)]
+            candidates = sorted(set.intersection(*grams))
+        return [self.names[i] for i in candidates if text in self.folded[i]]
+
+    def fuzzy(self, text, limit=SEARCH_LIMIT):
+        """Names ranked by the share of text's trigrams they contain; substring matches rank first"""
+        text = fold_name(text)
+        if len(text) < 3:
+            return self.search(text)[:limit]
+        padded = f" {text} "
+        grams = {padded[j:j + 3] for j in range(len(padded) - 2)}
+        shared = {}
+        for gram in grams:
+            for i in self.lookup(gram):
+                shared[i] = shared.get(i, 0) + 1
+        ranked = []
+        for i, count in shared.items():
+            score = count / len(grams) + (text in self.folded[i])
+            if score >= SEARCH_MIN_SCORE:
+                ranked.append((-score, self.names[i]))
+        ranked.sort()
+        return [name for _score, name in ranked[:limit]]
+
+class ScheduleModel:
+    """Process-wide view of the schedule snapshot plus the current ownership"""
+
+    def __init__(self):
+        self.version = ""
+        self.series_names = []      # series index -> table name
+        self.series_index = {}      # table name -> series index
+        self.series_weeks = []      # series index -> [(week, track_id, track name)]
+        self.series_cars = []       # series index -> set of car ids
+        self.series_car_names = []  # series index -> car names as listed in the schedule
+        self.series_meta = {}       # table name -> (class, license), normalized for filtering
+        self.car_index = None       # SearchIndex over every car name in the schedule and catalog
+        self.series_search = None   # SearchIndex over table names
+        self.track_index = None     # SearchIndex over every track name in the schedule and catalog
+        self.catalog_ids = {}       # "cars"/"tracks" -> {catalog name: id}
+        self.track_weeks = {}       # track id -> [(series index, week)]
+        self.car_series = {}        # car id -> set of series indexes
+        self.car_names = {}
+        self.track_names = {}
+        self.car_prices = {}        # car id -> price in dollars, None if it cannot be bought
+        self.track_prices = {}
+        self.licensed_cars = set()
+        self.licensed_tracks = set()
+        self.driveable = {}         # series index -> [week, ...]
+
+    @timed("model.load")
+    def load(self):
+        with open_schedule_snapshot() as snapshot:
+            self._load_snapshot(snapshot)
+        # Ownership is the only state read from SQLite
+        self.licensed_cars = licensed_ids("cars")
+        self.licensed_tracks = licensed_ids("tracks")
+        self._recompute(range(len(self.series_names)))
+        return self
+
+    def _load_snapshot(self, snapshot):
+        columns = snapshot.columns
+        strings = snapshot.strings
+        self.version = snapshot.version
+        self.series_names = snapshot.text("series_name")
+        self.series_index = {name: idx for idx, name in enumerate(self.series_names)}
+        self.series_meta = {name: (series_class.lower(), series_license.upper()) for name, series_class, series_license
+                            in zip(self.series_names, snapshot.text("series_class"), snapshot.text("series_license"))}
+
+        # Slice the flat columns per series; tolist() once is much cheaper than indexing the mapping row by row
+        week_start = columns["series_week_start"].tolist()
+        weeks = list(zip(columns["week"].tolist(),
+                         [None if track_id == NO_ID else track_id for track_id in columns["week_track_id"].tolist()],
+                         snapshot.text("week_track")))
+        self.series_weeks = [weeks[start:end] for start, end in zip(week_start, week_start[1:])]
+        for idx, series_weeks in enumerate(self.series_weeks):
+            for week, track_id, _track in series_weeks:
+                if track_id is not None:
+                    self.track_weeks.setdefault(track_id, []).append((idx, week))
+
+        car_start = columns["series_car_start"].tolist()
+        car_ids = columns["car_id"].tolist()
+        cars = snapshot.text("car")
+        self.series_car_names = [cars[start:end] for start, end in zip(car_start, car_start[1:])]
+        self.series_cars = [{car_id for car_id in car_ids[start:end] if car_id != NO_ID}
+                            for start, end in zip(car_start, car_start[1:])]
+        for idx, series_cars in enumerate(self.series_cars):
+            for car_id in series_cars:
+                self.car_series.setdefault(car_id, set()).add(idx)
+
+        for item_id, name, price in zip(columns["cars_id"].tolist(), snapshot.text("cars_name"), columns["cars_price"]):
+            self.car_names[item_id] = name
+            self.car_prices[item_id] = parse_price(strings[price])
+        for item_id, name, price in zip(columns["tracks_id"].tolist(), snapshot.text("tracks_name"), columns["tracks_price"]):
+            self.track_names[item_id] = name
+            self.track_prices[item_id] = parse_price(strings[price])
+
+        self.series_search = SearchIndex.from_snapshot(snapshot, "series")
+        self.car_index = SearchIndex.from_snapshot(snapshot, "cars")
+        self.track_index = SearchIndex.from_snapshot(snapshot, "tracks")
+        self.catalog_ids = {"cars": {name: i for i, name in self.car_names.items()},
+                            "tracks": {name: i for i, name in self.track_names.items()}}
+
+    @functools.cached_property
+    def car_name_series(self):
+        """Car name as listed in the schedule or catalog -> set of table names, built on the first search"""
+        name_series = {}
+        for idx, names in enumerate(self.series_car_names):
+            for name in names:
+                name_series.setdefault(name, set()).add(self.series_names[idx])
+        # Catalog names resolve to every schedule variant listed under the same car ID
+        for car_id, name in self.car_names.items():
+            for idx in self.car_series.get(car_id, ()):
+                name_series.setdefault(name, set()).add(self.series_names[idx])
+        return name_series
+
+    @functools.cached_property
+    def track_name_series(self):
+        """Track name as listed in the schedule or catalog -> set of table names, built on the first search"""
+        name_series = {}
+        for idx, series_weeks in enumerate(self.series_weeks):
+            for _week, track_id, track in series_weeks:
+                name_series.setdefault(track, set()).add(self.series_names[idx])
+                if track_id is not None:
+                    name_series.setdefault(self.track_names[track_id], set()).add(self.series_names[idx])
+        return name_series
+
+    def series_with_car(self, text):
+        """Table names of the series whose cars contain text, case-insensitively"""
+        found = set()
+        for name in self.car_index.search(text):
+            found |= self.car_name_series.get(name, set())
+        return found
+
+    def search_series(self, text):
+        """Table names of the series whose name, tracks or cars fuzzily match text"""
+        found = set(self.series_search.fuzzy(text))
+        for name in self.track_index.fuzzy(text):
+            found |= self.track_name_series.get(name, set())
+        for name in self.car_index.fuzzy(text):
+            found |= self.car_name_series.get(name, set())
+        return found
+
+    def search_catalog(self, kind, text):
+        """IDs of the "cars" or "tracks" catalog entries fuzzily matching text, best first"""
+        ids = self.catalog_ids[kind]
+        index = self.car_index if kind == "cars" else self.track_index
+        return [ids[name] for name in index.fuzzy(text, limit=None) if name in ids]
+
+    def _weeks_for(self, idx, licensed_cars, licensed_tracks):
+        if self.series_cars[idx].isdisjoint(licensed_cars):
+            return []
+        return [week for week, track_id, _track in self.series_weeks[idx] if track_id in licensed_tracks]
+
+    def _recompute(self, indexes):
+        for idx in indexes:
+            weeks = self._weeks_for(idx, self.licensed_cars, self.licensed_tracks)
+            if weeks:
+                self.driveable[idx] = weeks
+            else:
+                self.driveable.pop(idx, None)
+
+    def update_ownership(self, licensed_cars, licensed_tracks):
+        """Apply a new ownership state and recompute only the series it touches"""
+        changed_cars = self.licensed_cars ^ set(licensed_cars)
+        changed_tracks = self.licensed_tracks ^ set(licensed_tracks)
+        affected = set()
+        for car_id in changed_cars:
+            affected.update(self.car_series.get(car_id, ()))
+        for track_id in changed_tracks:
+            affected.update(idx for idx, _week in self.track_weeks.get(track_id, ()))
+
+        self.licensed_cars = set(licensed_cars)
+        self.licensed_tracks = set(licensed_tracks)
+        self._recompute(affected)
+        return affected
+
+    def apply_ownership_changes(self, changed_cars, changed_tracks):
+        """Apply {id: licensed} changes on top of the current ownership"""
+        cars = set(self.licensed_cars)
+        tracks = set(self.licensed_tracks)
+        for car_id, licensed in changed_cars.items():
+            (cars.add if licensed else cars.discard)(car_id)
+        for track_id, licensed in changed_tracks.items():
+            (tracks.add if licensed else tracks.discard)(track_id)
+        return self.update_ownership(cars, tracks)
+
+    def results(self):
+        result = [(self.series_names[idx], weeks) for idx, weeks in sorted(self.driveable.items())]
+        result.sort(key=lambda x: len(x[1]), reverse=True)
+        return result
+
+    def evaluate(self, licensed_cars, licensed_tracks):
+        """Like results(), for another ownership set, without touching the model's own state"""
+        result = []
+        for idx in range(len(self.series_names)):
+            weeks = self._weeks_for(idx, licensed_cars, licensed_tracks)
+            if weeks:
+                result.append((self.series_names[idx], weeks))
+        result.sort(key=lambda x: len(x[1]), reverse=True)
+        return result
+
+    def ids_for_names(self, names, kind):
+        """Map car or track names to IDs; returns (ids, unknown names)"""
+        by_name = {name: item_id for item_id, name in (self.car_names if kind == "cars" else self.track_names).items()}
+        ids = {by_name[name] for name in names if name in by_name}
+        return ids, [name for name in names if name not in by_name]
+
+    def driveable_weeks(self, series_name):
+        idx = self.series_index.get(series_name)
+        if idx is None:
+            return []
+        return [(week, track) for week, track_id, track in self.series_weeks[idx] if track_id in self.licensed_tracks]
+
+    def licensed_cars_for(self, series_name):
+        idx = self.series_index.get(series_name)
+        if idx is None:
+            return []
+        return sorted(self.car_names[car_id] for car_id in self.series_cars[idx] & self.licensed_cars)
+
+    def coverage_row(self, idx, licensed_cars, licensed_tracks, weeks=COVERAGE_WEEKS):
+        """One series' row of COVERAGE_* codes: 1 + track missing + 2 * car missing, or COVERAGE_NO_RACE"""
+        base = COVERAGE_OWNED + (2 if self.series_cars[idx].isdisjoint(licensed_cars) else 0)
+        row = bytearray(weeks)
+        for week, track_id, _track in self.series_weeks[idx]:
+            if 1 <= week <= weeks:
+                row[week - 1] = base + (track_id not in licensed_tracks)
+        return bytes(row)
+
+    def coverage(self, weeks=COVERAGE_WEEKS, licensed_cars=None, licensed_tracks=None):
+        """Series x week status matrix for the current (or the given) ownership, one row per series"""
+        licensed_cars = self.licensed_cars if licensed_cars is None else licensed_cars
+        licensed_tracks = self.licensed_tracks if licensed_tracks is None else licensed_tracks
+        return [self.coverage_row(idx, licensed_cars, licensed_tracks, weeks) for idx in range(len(self.series_names))]
+
+SCHEDULE_MODEL = None
+SCHEDULE_MODEL_LOCK = threading.Lock()
+
+def load_schedule_model():
+    global SCHEDULE_MODEL
+    with SCHEDULE_MODEL_LOCK:
+        SCHEDULE_MODEL = ScheduleModel().load()
+    return SCHEDULE_MODEL
+
+def get_schedule_model():
+    with SCHEDULE_MODEL_LOCK:
+        model = SCHEDULE_MODEL
+    if model is None or model.version != read_local_version():
+        model = load_schedule_model()
+    return model
+
+def analyze_schedule():
+    """Driveable (series, weeks) for the current ownership, from the planner cache when possible.
+
+    A hit needs only the data version and the licensed IDs, so it skips loading the schedule model.
+    """
+    with SCHEDULE_MODEL_LOCK:
+        model = SCHEDULE_MODEL
+    version = read_local_version()
+    if model is not None and model.version == version:
+        licensed_cars, licensed_tracks = model.licensed_cars, model.licensed_tracks
+    else:
+        licensed_cars, licensed_tracks = licensed_ids("cars"), licensed_ids("tracks")
+    key = ownership_hash(licensed_cars, licensed_tracks)
+
+    cache = get_planner_cache()
+    results = cache.get(version, key)
+    if results is None:
+        results = get_schedule_model().results()
+        cache.put(version, key, results)
+    return results
+
+# 🔹 Ownership change events: listeners get ({car_id: licensed}, {track_id: licensed})
+OWNERSHIP_LISTENERS = []
+SAVE_LOCK = threading.Lock()
+
+def notify_ownership_changed(changed_cars, changed_tracks):
+    if not changed_cars and not changed_tracks:
+        return
+    for listener in OWNERSHIP_LISTENERS:
+        listener(changed_cars, changed_tracks)
+
+def update_model_ownership(changed_cars, changed_tracks):
+    with SCHEDULE_MODEL_LOCK:
+        model = SCHEDULE_MODEL
+    if model is not None:
+        model.apply_ownership_changes(changed_cars, changed_tracks)
+
+OWNERSHIP_LISTENERS.append(update_model_ownership)
+
+# 🔹 Planner result cache: results depend only on the data version and the licensed sets
+PLANNER_CACHE_SIZE = 32
+
+def ownership_hash(licensed_cars, licensed_tracks):
+    cars, tracks = to_bitset(licensed_cars), to_bitset(licensed_tracks)
+    sha256 = hashlib.sha256(cars.to_bytes((cars.bit_length() + 7) // 8, "little"))
+    sha256.update(b"|")
+    sha256.update(tracks.to_bytes((tracks.bit_length() + 7) // 8, "little"))
+    return sha256.hexdigest()
+
+class ResultCache:
+    """Planner results persisted per (data version, ownership hash); least recently used entries are evicted.
+
+    Results also depend on how the engine reads the data, so the stored ones are dropped whenever
+    SNAPSHOT_FORMAT differs from the one they were computed with.
+    """
+
+    def __init__(self, path=PLANNER_CACHE_DB, max_entries=PLANNER_CACHE_SIZE):
+        self.db = Database(path)
+        self.max_entries = max_entries
+        self.memory = {}
+        self.db.write_connection().execute("""
+            CREATE TABLE IF NOT EXISTS result (version TEXT NOT NULL, ownership TEXT NOT NULL, value TEXT NOT NULL,
+                                               used REAL NOT NULL, PRIMARY KEY (version, ownership))""")
+        if self.db.query_value("PRAGMA user_version") != SNAPSHOT_FORMAT:
+            with self.db.transaction() as conn:
+                conn.execute("DELETE FROM result")
+                conn.execute(f"PRAGMA user_version = {int(SNAPSHOT_FORMAT)}")
+
+    def get(self, version, ownership):
+        key = (version, ownership)
+        if key in self.memory:
+            return self.memory[key]
+        value = self.db.query_value("SELECT value FROM result WHERE version = ? AND ownership = ?", key)
+        if value is None:
+            return None
+        self.db.execute("UPDATE result SET used = ? WHERE version = ? AND ownership = ?", (time.time(), *key))
+        self.memory[key] = [(name, weeks) for name, weeks in json.loads(value)]
+        return self.memory[key]
+
+    def put(self, version, ownership, results):
+        self.memory[(version, ownership)] = results
+        with self.db.transaction() as conn:
+            conn.execute("INSERT OR REPLACE INTO result VALUES (?, ?, ?, ?)",
+                         (version, ownership, json.dumps(results, ensure_ascii=False), time.time()))
+            conn.execute("DELETE FROM result WHERE rowid NOT IN (SELECT rowid FROM result ORDER BY used DESC LIMIT ?)",
+                         (self.max_entries,))
+
+    def forget(self, keep_version=None):
+        """Drop the session copies, and every stored result of another data version than keep_version"""
+        self.memory.clear()
+        if keep_version is not None:
+            self.db.execute("DELETE FROM result WHERE version != ?", (keep_version,))
+
+PLANNER_CACHE = None
+
+def get_planner_cache():
+    global PLANNER_CACHE
+    if PLANNER_CACHE is None:
+        PLANNER_CACHE = ResultCache()
+    return PLANNER_CACHE
+
+def invalidate_planner_cache(_changed_cars, _changed_tracks):
+    # Saved ownership gets a new hash; drop the session copies so old results are not kept alive
+    if PLANNER_CACHE is not None:
+        PLANNER_CACHE.forget()
+
+OWNERSHIP_LISTENERS.append(invalidate_planner_cache)
+
+def write_ownership_changes(changed_cars, changed_tracks):
+    """Persist {id: licensed} changes, one transaction per database"""
+    with SAVE_LOCK:
+        for table, changes in (("cars", changed_cars), ("tracks", changed_tracks)):
+            if changes:
+                CATALOGS[table].execute_many(f"UPDATE {table} SET licensed = ? WHERE id = ?",
+                                             [(1 if licensed else 0, item_id) for item_id, licensed in changes.items()])
+
+def save_ownership_changes(changed_cars, changed_tracks):
+    """Persist {id: licensed} changes and notify the ownership listeners"""
+    write_ownership_changes(changed_cars, changed_tracks)
+    notify_ownership_changed(changed_cars, changed_tracks)
+
+FREE_CONTENT_SQL = "price IS NULL OR price = '' OR price = 'Free'"
+
+def read_catalog(table):
+    """Return (id, name, licensed, price) rows of the cars or tracks catalog, ordered by name"""
+    return CATALOGS[table].query(f"SELECT id, name, licensed, price FROM {table} ORDER BY name")
+
+def licensed_ids(table):
+    """Set of the IDs marked as licensed in the cars or tracks catalog"""
+    return {row[0] for row in CATALOGS[table].query(f"SELECT id FROM {table} WHERE licensed = 1")}
+
+def reset_ownership_to_free(table):
+    """License exactly the free items of the cars or tracks catalog, notify the ownership listeners
+    of the difference and return the free IDs"""
+    with SAVE_LOCK:
+        before = licensed_ids(table)
+        CATALOGS[table].execute(f"UPDATE {table} SET licensed = CASE WHEN {FREE_CONTENT_SQL} THEN 1 ELSE 0 END")
+        free = licensed_ids(table)
+    changes = {item_id: item_id in free for item_id in before ^ free}
+    notify_ownership_changed(*((changes, {}) if table == "cars" else ({}, changes)))
+    return free
+
+@timed("planner.filter")
+def filter_series(series_data, filters, model):
+    """Return the (series, weeks) entries matching the planner filters, using the model's cached metadata"""
+    category = filters["category"].lower() if filters["category"] != "All" else None
+    license_class = filters["class"].upper() if filters["class"] != "All" else None
+    series_text = filters["series"].lower() if filters["series"] != "All" else None
+    car_series = model.series_with_car(filters["car"]) if filters["car"] != "All" else None
+    week_num = None
+    if filters["week"] != "All":
+        try:
+            week_num = int(filters["week"])
+        except ValueError:
+            pass
+
+    result = []
+    for series_name, weeks in series_data:
+        series_class, series_license = model.series_meta.get(series_name, ("", ""))
+        if category and category not in series_class:
+            continue
+        if license_class and license_class != series_license:
+            continue
+        if series_text and series_text not in series_name.lower():
+            continue
+        if week_num is not None and week_num not in weeks:
+            continue
+        if car_series is not None and series_name not in car_series:
+            continue
+        result.append((series_name, weeks))
+    return result
+
+class PurchaseOptimizer:
+    """Greedy "what to buy next" search with incremental gain bookkeeping.
+
+    A series week is driveable when the series has an owned car and the week's track is owned. The gain
+    of every unowned car, track and car+track bundle is kept up to date as purchases are made, so each
+    step only touches the series the purchase affects.
+    """
+
+    def __init__(self, model, licensed_cars, licensed_tracks):
+        self.model = model
+        self.cars = set(licensed_cars)
+        self.tracks = set(licensed_tracks)
+        self.car_ok = [not cars.isdisjoint(self.cars) for cars in model.series_cars]
+        self.owned_weeks = [sum(1 for _w, track_id, _t in weeks if track_id in self.tracks) for weeks in model.series_weeks]
+        self.total_weeks = sum(n for n, ok in zip(self.owned_weeks, self.car_ok) if ok)
+
+        self.car_gain = {c: 0 for c, price in model.car_prices.items() if c not in self.cars and price is not None}
+        self.track_gain = {t: 0 for t, price in model.track_prices.items() if t not in self.tracks and price is not None}
+        self.bundle_gain = {}   # (car id, track id) -> weeks only unlocked by buying both
+        for idx, weeks in enumerate(model.series_weeks):
+            self._add_series(idx, weeks, 1)
+
+    def _add_series(self, idx, weeks, sign):
+        """Add (sign=1) or remove (sign=-1) a series' contribution to the candidate gains"""
+        series_cars = [c for c in self.model.series_cars[idx] if c in self.car_gain]
+        missing = [track_id for _w, track_id, _t in weeks if track_id in self.track_gain]
+        if self.car_ok[idx]:
+            for track_id in missing:
+                self.track_gain[track_id] += sign
+            return
+        for c in series_cars:
+            self.car_gain[c] += sign * self.owned_weeks[idx]
+            for track_id in missing:
+                key = (c, track_id)
+                self.bundle_gain[key] = self.bundle_gain.get(key, 0) + sign
+                if not self.bundle_gain[key]:
+                    del self.bundle_gain[key]
+
+    def _series_of(self, car_ids=(), track_ids=()):
+        affected = set()
+        for c in car_ids:
+            affected.update(self.model.car_series.get(c, ()))
+        for t in track_ids:
+            affected.update(idx for idx, _week in self.model.track_weeks.get(t, ()))
+        return affected
+
+    def candidates(self):
+        """All purchasable options as (gain, cost, [("car"|"track", id), ...]) with a positive gain"""
+        options = []
+        for c, gain in self.car_gain.items():
+            if gain > 0:
+                options.append((gain, self.model.car_prices[c], [("car", c)]))
+        for t, gain in self.track_gain.items():
+            if gain > 0:
+                options.append((gain, self.model.track_prices[t], [("track", t)]))
+        for (c, t), synergy in self.bundle_gain.items():
+            if c in self.car_gain and t in self.track_gain:
+                options.append((self.car_gain[c] + self.track_gain[t] + synergy,
+                                self.model.car_prices[c] + self.model.track_prices[t], [("car", c), ("track", t)]))
+        return options
+
+    def ranked(self, limit=None):
+        options = sorted(self.candidates(), key=lambda o: (-(o[0] / o[1] if o[1] else float("inf")), o[1]))
+        return options[:limit] if limit else options
+
+    def buy(self, items):
+        car_ids = [i for kind, i in items if kind == "car"]
+        track_ids = [i for kind, i in items if kind == "track"]
+        affected = self._series_of(car_ids, track_ids)
+        for idx in affected:
+            self._add_series(idx, self.model.series_weeks[idx], -1)
+
+        for c in car_ids:
+            self.cars.add(c)
+            del self.car_gain[c]
+        for t in track_ids:
+            self.tracks.add(t)
+            del self.track_gain[t]
+        self.bundle_gain = {key: gain for key, gain in self.bundle_gain.items()
+                            if key[0] in self.car_gain and key[1] in self.track_gain}
+
+        for idx in affected:
+            if self.car_ok[idx]:
+                self.total_weeks -= self.owned_weeks[idx]
+            self.car_ok[idx] = not self.model.series_cars[idx].isdisjoint(self.cars)
+            self.owned_weeks[idx] = sum(1 for _w, track_id, _t in self.model.series_weeks[idx] if track_id in self.tracks)
+            if self.car_ok[idx]:
+                self.total_weeks += self.owned_weeks[idx]
+            self._add_series(idx, self.model.series_weeks[idx], 1)
+
+    def plan(self, budget):
+        """Greedily buy the best gain-per-dollar option that fits the remaining budget"""
+        purchases = []
+        remaining = budget
+        while True:
+            affordable = [o for o in self.ranked() if o[1] <= remaining + 1e-9]
+            if not affordable:
+                break
+            gain, cost, items = affordable[0]
+            self.buy(items)
+            remaining -= cost
+            purchases.append({
+                "items": [{"type": kind, "name": (self.model.car_names if kind == "car" else self.model.track_names)[i]}
+                          for kind, i in items],
+                "cost": round(cost, 2),
+                "gain_weeks": gain,
+                "total_weeks": self.total_weeks,
+            })
+        return purchases
+
+def to_bitset(ids):
+    bits = 0
+    for item_id in ids:
+        bits |= 1 << item_id
+    return bits
+
+def iter_bits(bits):
+    while bits:
+        low = bits & -bits
+        yield low.bit_length() - 1
+        bits ^= low
+
+def from_bitset(bits):
+    return set(iter_bits(bits))
+
+class ProfileStore:
+    """Named ownership sets stored as car/track ID bitsets in a user-owned database.
+
+    Bitsets are tied to the catalog version they were saved with; the store keeps that version's
+    id -> name mapping so profiles can be remapped by name after an update renumbers the catalog.
+    """
+
+    def __init__(self, model, path=PROFILES_DB):
+        self.model = model
+        self.db = Database(path)
+        self.db.write_connection().executescript("""
+            CREATE TABLE IF NOT EXISTS profile (name TEXT PRIMARY KEY, version TEXT NOT NULL,
+                                                cars BLOB NOT NULL, tracks BLOB NOT NULL);
+            CREATE TABLE IF NOT EXISTS catalog (version TEXT NOT NULL, kind TEXT NOT NULL, id INTEGER NOT NULL,
+                                                name TEXT NOT NULL, PRIMARY KEY (version, kind, id));
+        """)
+        self._migrate()
+
+    def _remember_catalog(self, conn):
+        version = self.model.version
+        if conn.execute("SELECT 1 FROM catalog WHERE version = ? LIMIT 1", (version,)).fetchone():
+            return
+        conn.executemany("INSERT INTO catalog VALUES (?, 'cars', ?, ?)",
+                         [(version, i, n) for i, n in self.model.car_names.items()])
+        conn.executemany("INSERT INTO catalog VALUES (?, 'tracks', ?, ?)",
+                         [(version, i, n) for i, n in self.model.track_names.items()])
+
+    def _migrate(self):
+        """Remap profiles saved against an older catalog version onto the current IDs"""
+        stale = self.db.query("SELECT name, version, cars, tracks FROM profile WHERE version != ?",
+                              (self.model.version,))
+        with self.db.transaction() as conn:
+            self._remember_catalog(conn)
+            for name, version, cars, tracks in stale:
+                old_names = {}
+                for kind, item_id, item_name in conn.execute(
+                        "SELECT kind, id, name FROM catalog WHERE version = ?", (version,)):
+                    old_names[(kind, item_id)] = item_name
+                remapped = []
+                for kind, blob in (("cars", cars), ("tracks", tracks)):
+                    names = [old_names[(kind, i)] for i in from_bitset(int.from_bytes(blob, "little"))
+                             if (kind, i) in old_names]
+                    remapped.append(self.model.ids_for_names(names, kind)[0])
+                self._write(conn, name, *remapped)
+            conn.execute("DELETE FROM catalog WHERE version NOT IN (SELECT version FROM profile) AND version != ?",
+                         (self.model.version,))
+
+    def _write(self, conn, name, car_ids, track_ids):
+        cars, tracks = to_bitset(car_ids), to_bitset(track_ids)
+        conn.execute("INSERT OR REPLACE INTO profile VALUES (?, ?, ?, ?)",
+                     (name, self.model.version, cars.to_bytes((cars.bit_length() + 7) // 8, "little"),
+                      tracks.to_bytes((tracks.bit_length() + 7) // 8, "little")))
+
+    def save(self, name, car_ids, track_ids):
+        with self.db.transaction() as conn:
+            self._write(conn, name, car_ids, track_ids)
+
+    def delete(self, name):
+        self.db.execute("DELETE FROM profile WHERE name = ?", (name,))
+
+    def names(self):
+        return [row[0] for row in self.db.query("SELECT name FROM profile ORDER BY name")]
+
+    def bitsets(self, names=None):
+        """{name: (car bitset, track bitset)} for the given or all profiles"""
+        result = {}
+        for name, cars, tracks in self.db.query("SELECT name, cars, tracks FROM profile ORDER BY name"):
+            if names is None or name in names:
+                result[name] = (int.from_bytes(cars, "little"), int.from_bytes(tracks, "little"))
+        return result
+
+    def close(self):
+        self.db.close()
+
+def evaluate_profiles(model, profiles):
+    """Driveable (series, weeks) lists for many {name: (car bitset, track bitset)} profiles in one pass.
+
+    The bitsets are transposed into per-car and per-track bitsets over the profiles, so every series
+    week costs a single AND regardless of how many profiles are evaluated.
+    """
+    names = list(profiles)
+    car_holders = {}
+    track_holders = {}
+    for p, name in enumerate(names):
+        car_bits, track_bits = profiles[name]
+        for car_id in iter_bits(car_bits):
+            car_holders[car_id] = car_holders.get(car_id, 0) | (1 << p)
+        for track_id in iter_bits(track_bits):
+            track_holders[track_id] = track_holders.get(track_id, 0) | (1 << p)
+
+    weeks_by_profile = [[] for _ in names]
+    for idx, weeks in enumerate(model.series_weeks):
+        with_car = 0
+        for car_id in model.series_cars[idx]:
+            with_car |= car_holders.get(car_id, 0)
+        if not with_car:
+            continue
+        driveable = {}
+        for week, track_id, _track in weeks:
+            for p in iter_bits(with_car & track_holders.get(track_id, 0)):
+                driveable.setdefault(p, []).append(week)
+        for p, series_weeks in driveable.items():
+            weeks_by_profile[p].append((model.series_names[idx], series_weeks))
+
+    result = {}
+    for p, name in enumerate(names):
+        weeks_by_profile[p].sort(key=lambda x: len(x[1]), reverse=True)
+        result[name] = weeks_by_profile[p]
+    return result
+
+class SeasonPlanner:
+    """Week-by-week season plan: up to sessions_per_week driveable series per week.
+
+    Each week fills as many sessions as it has driveable races, preferring the series in `preferred`
+    by their order and then any other driveable series if fill is set. The per-week limit is the only
+    constraint tying series together and weeks do not constrain each other, so taking the best-ranked
+    candidates of every week independently is an optimal assignment. After an ownership change only
+    the weeks in which an affected series races are solved again.
+    """
+
+    def __init__(self, model, preferred=(), sessions_per_week=1, fill=True, licensed_cars=None, licensed_tracks=None):
+        self.model = model
+        self.sessions_per_week = sessions_per_week
+        self.fill = fill
+        self.licensed_cars = set(model.licensed_cars if licensed_cars is None else licensed_cars)
+        self.licensed_tracks = set(model.licensed_tracks if licensed_tracks is None else licensed_tracks)
+        self.rank = {model.series_index[name]: rank for rank, name in enumerate(preferred) if name in model.series_index}
+        self.candidates = sorted(self.rank, key=self.rank.get)
+        if fill:
+            self.candidates += sorted((idx for idx in range(len(model.series_names)) if idx not in self.rank),
+                                      key=lambda idx: model.series_names[idx])
+        self.rows = model.coverage(COVERAGE_WEEKS, self.licensed_cars, self.licensed_tracks)
+        self.weeks = {}             # week -> [series index, ...] in preference order
+        self.solve(range(1, COVERAGE_WEEKS + 1))
+
+    def solve(self, weeks):
+        """Re-pick the series of the given weeks; returns the weeks whose picks changed"""
+        changed = []
+        for week in weeks:
+            picks = [idx for idx in self.candidates if self.rows[idx][week - 1] == COVERAGE_OWNED]
+            picks = picks[:self.sessions_per_week]
+            if picks != self.weeks.get(week, []):
+                changed.append(week)
+            self.weeks[week] = picks
+        return changed
+
+    def update(self, changed_cars, changed_tracks):
+        """Apply {id: licensed} changes and re-solve only the affected weeks"""
+        affected = set()
+        for car_id, licensed in changed_cars.items():
+            (self.licensed_cars.add if licensed else self.licensed_cars.discard)(car_id)
+            affected |= self.model.car_series.get(car_id, set())
+        for track_id, licensed in changed_tracks.items():
+            (self.licensed_tracks.add if licensed else self.licensed_tracks.discard)(track_id)
+            affected.update(idx for idx, _week in self.model.track_weeks.get(track_id, ()))
+        weeks = set()
+        for idx in affected:
+            self.rows[idx] = self.model.coverage_row(idx, self.licensed_cars, self.licensed_tracks)
+            weeks.update(week for week, _track_id, _track in self.model.series_weeks[idx] if 1 <= week <= COVERAGE_WEEKS)
+        return self.solve(sorted(weeks))
+
+    def races(self):
+        """Planned races as plain data, by week and preference"""
+        result = []
+        for week in sorted(self.weeks):
+            for idx in self.weeks[week]:
+                track = next(t for w, _track_id, t in self.model.series_weeks[idx] if w == week)
+                result.append({"week": week, "series": self.model.series_names[idx], "track": track,
+                               "cars": sorted(self.model.car_names[car_id]
+                                              for car_id in self.model.series_cars[idx] & self.licensed_cars),
+                               "preferred": idx in self.rank})
+        return result
+
+def write_season_csv(races, f):
+    writer = csv.writer(f)
+    writer.writerow(["week", "series", "track", "cars", "preferred"])
+    for race in races:
+        writer.writerow([race["week"], race["series"], race["track"], "; ".join(race["cars"]), int(race["preferred"])])
+
+def ical_text(text):
+    return text.replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,").replace("\n", "\\n")
+
+def ical_line(line):
+    """Fold a content line at 75 octets as RFC 5545 requires"""
+    data = line.encode("utf-8")
+    parts = []
+    while len(data) > 75:
+        cut = 75 if not parts else 74
+        while cut and (data[cut] & 0xC0) == 0x80:    # do not split a UTF-8 sequence
+            cut -= 1
+        parts.append(data[:cut].decode("utf-8"))
+        data = data[cut:]
+    parts.append(data.decode("utf-8"))
+    return "\r\n ".join(parts)
+
+def write_season_ical(races, f, season_start, version=""):
+    """Write races as all-day iCalendar events spanning their race week, week 1 starting on season_start"""
+    stamp = datetime.datetime.now(datetime.timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    lines = ["BEGIN:VCALENDAR", "VERSION:2.0", "PRODID:-//SeriesChecker//Season Plan//EN", "CALSCALE:GREGORIAN"]
+    for race in races:
+        start = season_start + datetime.timedelta(weeks=race["week"] - 1)
+        end = start + datetime.timedelta(weeks=1)
+        lines += [
+            "BEGIN:VEVENT",
+            f"UID:{version}-{race['series']}-{race['week']}@seriesChecker",
+            f"DTSTAMP:{stamp}",
+            f"DTSTART;VALUE=DATE:{start:%Y%m%d}",
+            f"DTEND;VALUE=DATE:{end:%Y%m%d}",
+            f"SUMMARY:{ical_text(race['series'].replace('_', ' ') + ' – ' + race['track'])}",
+            f"DESCRIPTION:{ical_text('Week ' + str(race['week']) + ' | Cars: ' + ', '.join(race['cars']))}",
+            "END:VEVENT",
+        ]
+    lines.append("END:VCALENDAR")
+    f.write("".join(ical_line(line) + "\r\n" for line in lines))
+
+def plan(model, licensed_cars, licensed_tracks, filters, series_data=None):
+    """Driveable series for an ownership set as plain data: series, weeks with tracks and matching cars"""
+    if series_data is None:
+        series_data = model.evaluate(licensed_cars, licensed_tracks)
+    plan_rows = []
+    for series_name, weeks in filter_series(series_data, filters, model):
+        idx = model.series_index[series_name]
+        plan_rows.append({
+            "series": series_name,
+            "weeks": [{"week": week, "track": track} for week, track_id, track in model.series_weeks[idx]
+                      if track_id in licensed_tracks],
+            "cars": sorted(model.car_names[car_id] for car_id in model.series_cars[idx] & licensed_cars),
+        })
+    return plan_rows
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Print the driveable series, weeks and cars for ownership profiles.")
+    parser.add_argument("--profile", action="append", default=[],
+                        help='JSON file {"cars": [...], "tracks": [...]} with owned names; repeatable. '
+                             "Defaults to the content licensed in data/cars.db and data/tracks.db")
+    parser.add_argument("--category", default="All")
+    parser.add_argument("--class", dest="license_class", default="All", help="License class (R, D, C, B, A, Pro)")
+    parser.add_argument("--series", default="All")
+    parser.add_argument("--car", default="All")
+    parser.add_argument("--week", default="All")
+    parser.add_argument("--format", choices=("json", "csv"), default="json")
+    parser.add_argument("--stored", action="store_true",
+                        help="Evaluate every profile saved in profiles.db (in addition to --profile files)")
+    parser.add_argument("--save", action="store_true", help="Save the --profile files to profiles.db under their file names")
+    parser.add_argument("--budget", type=float,
+                        help="Instead of the plan, print the purchases that add the most driveable weeks within this budget")
+    parser.add_argument("--season", action="store_true",
+                        help="Instead of the plan, print a week-by-week season plan of driveable races")
+    parser.add_argument("--prefer", action="append", default=[],
+                        help="Series (table name) to plan first, in order of preference; repeatable")
+    parser.add_argument("--sessions", type=int, default=1, help="Races per week in the season plan")
+    parser.add_argument("--only-preferred", action="store_true",
+                        help="Do not fill free sessions with series that were not given with --prefer")
+    parser.add_argument("--ical", metavar="PATH", help="Also write the season plan as an iCalendar file")
+    parser.add_argument("--season-start", type=datetime.date.fromisoformat, default=datetime.date.today(),
+                        help="Date of week 1 for --ical (YYYY-MM-DD, default today)")
+    args = parser.parse_args(argv)
+
+    model = get_schedule_model()
+    filters = {"category": args.category, "class": args.license_class, "series": args.series,
+               "car": args.car, "week": args.week}
+
+    ownership = {}
+    store = ProfileStore(model) if args.stored or args.save else None
+    if args.stored:
+        for name, (car_bits, track_bits) in store.bitsets().items():
+            ownership[name] = (from_bitset(car_bits), from_bitset(track_bits))
+    elif not args.profile:
+        ownership["licensed"] = (model.licensed_cars, model.licensed_tracks)
+    for path in args.profile:
+        with open(path, "r", encoding="utf-8") as f:
+            owned = json.load(f)
+        car_ids, unknown_cars = model.ids_for_names(owned.get("cars", []), "cars")
+        track_ids, unknown_tracks = model.ids_for_names(owned.get("tracks", []), "tracks")
+        for name in unknown_cars + unknown_tracks:
+            print(f"{path}: unknown content '{name}'", file=sys.stderr)
+        ownership[os.path.splitext(os.path.basename(path))[0]] = (car_ids, track_ids)
+        if args.save:
+            store.save(os.path.splitext(os.path.basename(path))[0], car_ids, track_ids)
+    if store:
+        store.close()
+
+    if args.season:
+        seasons = {name: SeasonPlanner(model, args.prefer, args.sessions, not args.only_preferred, cars, tracks).races()
+                   for name, (cars, tracks) in ownership.items()}
+        if args.ical:
+            with open(args.ical, "w", encoding="utf-8", newline="") as f:
+                # One event per race even if several profiles plan it
+                races = {(race["week"], race["series"]): race for races in seasons.values() for race in races}
+                write_season_ical([races[key] for key in sorted(races)], f, args.season_start, model.version)
+        if args.format == "json":
+            json.dump({"version": model.version, "profiles": seasons}, sys.stdout, ensure_ascii=False, indent=2)
+            print()
+        else:
+            for name, races in seasons.items():
+                print(f"# {name}")
+                write_season_csv(races, sys.stdout)
+        return
+
+    if args.budget is not None:
+        purchases = {name: PurchaseOptimizer(model, cars, tracks).plan(args.budget)
+                     for name, (cars, tracks) in ownership.items()}
+        if args.format == "json":
+            json.dump({"version": model.version, "budget": args.budget, "profiles": purchases},
+                      sys.stdout, ensure_ascii=False, indent=2)
+            print()
+        else:
+            writer = csv.writer(sys.stdout)
+            writer.writerow(["profile", "step", "items", "cost", "gain_weeks", "total_weeks"])
+            for name, steps in purchases.items():
+                for step, p in enumerate(steps, start=1):
+                    writer.writerow([name, step, " + ".join(i["name"] for i in p["items"]),
+                                     p["cost"], p["gain_weeks"], p["total_weeks"]])
+        return
+
+    series_data = evaluate_profiles(model, {name: (to_bitset(cars), to_bitset(tracks))
+                                            for name, (cars, tracks) in ownership.items()})
+    profiles = {name: plan(model, cars, tracks, filters, series_data[name]) for name, (cars, tracks) in ownership.items()}
+
+    if args.format == "json":
+        json.dump({"version": model.version, "profiles": profiles}, sys.stdout, ensure_ascii=False, indent=2)
+        print()
+    else:
+        writer = csv.writer(sys.stdout)
+        writer.writerow(["profile", "series", "week", "track", "cars"])
+        for profile, plan_rows in profiles.items():
+            for row in plan_rows:
+                for week in row["weeks"]:
+                    writer.writerow([profile, row["series"], week["week"], week["track"], "; ".join(row["cars"])])
+
+if __name__ == "__main__":
+    main()
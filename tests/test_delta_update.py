@@ -0,0 +1,122 @@
+"""Delta and full (data.zip) updates against a local HTTP server must leave identical data directories.
+
+Each install runs schedule_engine in a fresh process, since its data paths and update URL are read
+from the working directory and environment at import time.
+"""
+import sqlite3
+import functools, http.server, os, shutil, subprocess, sys, threading, zipfile
+
+import pytest
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+OLD_VERSION, NEW_VERSION = "2000.01.01", "2000.01.08"
+
+def run(args, cwd, base_url=""):
+    env = dict(os.environ, PYTHONPATH=REPO, SERIESCHECKER_UPDATE_URL=base_url, SERIESCHECKER_CHECK_INTERVAL="0")
+    return subprocess.run([sys.executable, *args], cwd=cwd, env=env, capture_output=True, text=True, check=True).stdout
+
+def publish(path, data_dir, version, manifest=True):
+    """Lay out a published version like the repository root: data.zip, version.txt and optionally the delta files"""
+    os.makedirs(path)
+    with zipfile.ZipFile(os.path.join(path, "data.zip"), "w") as z:
+        for name in sorted(os.listdir(data_dir)):
+            z.write(os.path.join(data_dir, name), name)
+    with open(os.path.join(path, "version.txt"), "w", encoding="utf-8") as f:
+        f.write(version)
+    run([os.path.join(REPO, "build_manifest.py")], cwd=path)
+    if not manifest:
+        os.remove(os.path.join(path, "manifest.json"))
+        shutil.rmtree(os.path.join(path, "delta"))
+
+class QuietHandler(http.server.SimpleHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def serve():
+    servers = []
+    def start(directory):
+        handler = functools.partial(QuietHandler, directory=directory)
+        server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return f"http://127.0.0.1:{server.server_port}"
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+def dump(data_dir):
+    """Every row of every table in the data directory's databases, user columns included"""
+    tables = {}
+    for name in ("cars.db", "tracks.db", "schedule.db"):
+        conn = sqlite3.connect(os.path.join(data_dir, name))
+        for (table,) in conn.execute("SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%'"):
+            tables[(name, table)] = sorted(conn.execute(f'SELECT * FROM "{table}"').fetchall(), key=repr)
+        conn.close()
+    return tables
+
+def test_delta_and_full_update_match(tmp_path, serve):
+    old_data = tmp_path / "old_data"
+    with zipfile.ZipFile(os.path.join(REPO, "data.zip")) as z:
+        z.extractall(old_data)
+    new_data = tmp_path / "new_data"
+    shutil.copytree(old_data, new_data)
+    conn = sqlite3.connect(new_data / "cars.db")
+    conn.execute("INSERT INTO cars (name, count, price, licensed) VALUES ('Delta Test Free Car', '1', 'Free', 1)")
+    conn.execute("INSERT INTO cars (name, count, price, licensed) VALUES ('Delta Test Paid Car', '1', '$11.95', 0)")
+    conn.commit()
+    conn.close()
+
+    publish(tmp_path / "old", old_data, OLD_VERSION)
+    publish(tmp_path / "new", new_data, NEW_VERSION)
+    publish(tmp_path / "new_full", new_data, NEW_VERSION, manifest=False)
+    old_url, delta_url, full_url = serve(str(tmp_path / "old")), serve(str(tmp_path / "new")), serve(str(tmp_path / "new_full"))
+
+    results = {}
+    for name, url in (("delta", delta_url), ("full", full_url)):
+        client = tmp_path / name
+        client.mkdir()
+        run(["-c", "import schedule_engine; schedule_engine.check_for_updates()"], cwd=client, base_url=old_url)
+        # Some owned paid content that has to survive the update
+        conn = sqlite3.connect(client / "data" / "cars.db")
+        conn.execute("UPDATE cars SET licensed = 1 WHERE id IN (SELECT id FROM cars WHERE price != 'Free' LIMIT 3)")
+        conn.commit()
+        conn.close()
+        # The servers publish version.txt within the same second, so the old server's Last-Modified would get a 304
+        os.remove(client / "update_state.json")
+        out = run(["-c", "import schedule_engine; schedule_engine.check_for_updates()"], cwd=client, base_url=url)
+        assert f"Update completed (v{NEW_VERSION})" in out
+        if name == "delta":
+            assert "Delta update fetched" in out
+        with open(client / "data" / "local_version.txt", encoding="utf-8") as f:
+            assert f.read().strip() == NEW_VERSION
+        results[name] = dump(client / "data")
+
+    assert results["delta"] == results["full"]
+    licensed = {row[1]: row[-1] for row in results["delta"][("cars.db", "cars")]}
+    assert licensed["Delta Test Free Car"] == 1
+    assert licensed["Delta Test Paid Car"] == 0
+
+def test_unowned_during_download_stays_unowned(tmp_path, serve):
+    # The delta path copies the data directory into staging before downloading; a license removed
+    # after that copy must not come back with the swap
+    old_data = tmp_path / "old_data"
+    with zipfile.ZipFile(os.path.join(REPO, "data.zip")) as z:
+        z.extractall(old_data)
+    publish(tmp_path / "old", old_data, OLD_VERSION)
+    client = tmp_path / "client"
+    client.mkdir()
+    old_url = serve(str(tmp_path / "old"))
+    run(["-c", "import schedule_engine; schedule_engine.check_for_updates()"], cwd=client, base_url=old_url)
+
+    out = run(["-c", """
+import shutil, schedule_engine as e
+e.save_ownership_changes({1: True}, {})
+e.close_databases()
+shutil.copytree(e.DATA_DIR, e.STAGING_DIR)
+e.save_ownership_changes({1: False}, {})
+e.install_staged_data("v2")
+print(e.CARS.query_value("SELECT licensed FROM cars WHERE id = 1"))
+"""], cwd=client)
+    assert out.strip() == "0"
@@ -0,0 +1,79 @@
+"""fetch_online_version against a local HTTP server: ETag revalidation, the freshness window and backoff."""
+import http.server, threading
+
+import pytest, requests
+
+import schedule_engine
+
+ETAG = '"v2-etag"'
+
+class VersionHandler(http.server.BaseHTTPRequestHandler):
+    """Serves version.txt with the server's status, answering a matching If-None-Match with a 304"""
+
+    def do_GET(self):
+        self.server.requests.append(dict(self.headers))
+        if self.server.status != 200:
+            self.send_response(self.server.status)
+            self.end_headers()
+            return
+        if self.headers.get("If-None-Match") == ETAG:
+            self.send_response(304)
+            self.end_headers()
+            return
+        body = b"2000.01.08\n"
+        self.send_response(200)
+        self.send_header("ETag", ETAG)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def server(tmp_path, monkeypatch):
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), VersionHandler)
+    server.status = 200
+    server.requests = []
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    monkeypatch.setattr(schedule_engine, "UPDATE_BASE_URL", f"http://127.0.0.1:{server.server_port}")
+    monkeypatch.setattr(schedule_engine, "UPDATE_STATE_FILE", str(tmp_path / "update_state.json"))
+    monkeypatch.setattr(schedule_engine, "UPDATE_CHECK_INTERVAL", 3600)
+    yield server
+    server.shutdown()
+    server.server_close()
+
+def test_200_stores_etag(server):
+    assert schedule_engine.fetch_online_version("2000.01.01") == "2000.01.08"
+    state = schedule_engine.read_update_state()
+    assert state["etag"] == ETAG
+    assert state["version"] == "2000.01.08"
+
+def test_fresh_check_sends_no_request(server):
+    schedule_engine.fetch_online_version("2000.01.01")
+    assert schedule_engine.fetch_online_version("2000.01.08") is None
+    assert len(server.requests) == 1
+
+def test_unchanged_version_gets_304(server, monkeypatch):
+    monkeypatch.setattr(schedule_engine, "UPDATE_CHECK_INTERVAL", 0)
+    schedule_engine.fetch_online_version("2000.01.01")
+    assert schedule_engine.fetch_online_version("2000.01.08") == "2000.01.08"
+    assert server.requests[-1]["If-None-Match"] == ETAG
+    assert schedule_engine.read_update_state()["etag"] == ETAG
+
+def test_backoff_after_503(server):
+    server.status = 503
+    with pytest.raises(requests.HTTPError):
+        schedule_engine.fetch_online_version("2000.01.01")
+    assert schedule_engine.read_update_state()["failures"] == 1
+
+    # Within the retry time no request is sent, and the server coming back does not matter yet
+    server.status = 200
+    with pytest.raises(ConnectionError):
+        schedule_engine.fetch_online_version("2000.01.01")
+    assert len(server.requests) == 1
+
+    # A first install has nothing to fall back on, so it ignores the backoff
+    assert schedule_engine.fetch_online_version() == "2000.01.08"
+    assert len(server.requests) == 2
+    assert schedule_engine.read_update_state()["failures"] == 0